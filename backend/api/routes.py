@@ -3,23 +3,48 @@ API routes for the semantic network analyzer.
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Depends, Request
-from fastapi.responses import JSONResponse, Response
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Optional, List, Dict, Any, Union
+import asyncio
+import io
+import logging
 import pandas as pd
-import tempfile
+import hashlib
 import os
-import json
+import orjson
 import time
 
+from contextlib import contextmanager
+from functools import partial
+
 from core import TextProcessor, NetworkBuilder, ComparisonAnalyzer, MultiGroupAnalyzer, get_semantic_analyzer, get_chat_service
 from core.config import settings
 from core.export_service import export_excel, export_json, export_graphml, export_gexf
-from core.cache_service import get_cached, set_cached, hash_content
+from core.cache_service import (
+    get_cached,
+    set_cached,
+    get_cached_texts,
+    set_cached_texts,
+    make_session_key,
+    get_session_tokens,
+    set_session_tokens,
+    get_cached_chat,
+    set_cached_chat,
+    make_context_key,
+    get_cached_context,
+    set_cached_context,
+    seen_webhook_event,
+    stale_subscription_event,
+)
 from core.auth import get_current_user, TokenData
 from core.tier_limits import get_tier_limits, TIER_LIMITS, TIER_PRICING
 from core.supabase_client import (
     get_user_profile,
+    get_profile_bundle,
+    check_analysis_bundle,
+    complete_checkout,
     increment_analysis_count,
     increment_chat_count,
     check_analysis_limit,
@@ -47,6 +72,59 @@ from core.stripe_service import (
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# Chunk size for streaming uploads to disk (1 MiB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Strong references to fire-and-forget tasks so the event loop cannot
+# garbage-collect them mid-flight
+_pending_tasks: set = set()
+
+
+def _log_usage_background(user_id: str, action: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Schedule a usage-log write without holding up the response."""
+    task = asyncio.create_task(log_usage(user_id, action, metadata))
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+
+
+class _StageTimer:
+    """
+    Accumulates per-stage durations and emits one log line per request.
+
+    Replaces the inline time.time() + print() pairs in the analysis
+    endpoints: perf_counter is monotonic, and deferring to a single
+    logging call keeps synchronous stdout flushes out of the hot path.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.stages: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage; records even if the body raises."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - t0
+
+    def elapsed(self) -> float:
+        """Seconds since the timer started, rounded for responses."""
+        return round(time.perf_counter() - self._start, 2)
+
+    def log(self) -> float:
+        """Emit the consolidated timing line and return the total."""
+        total = time.perf_counter() - self._start
+        details = " ".join(
+            f"{name}={duration:.2f}s" for name, duration in self.stages.items()
+        )
+        logger.info("[TIMING] %s %s total=%.2fs", self.label, details, total)
+        return round(total, 2)
+
 
 class WordMapping(BaseModel):
     """Word mapping model."""
@@ -67,50 +145,246 @@ class AnalysisConfig(BaseModel):
     unify_plurals: bool = True
 
 
-def read_file_texts(file: UploadFile, text_column: int = 1) -> List[str]:
+class WordConfig(BaseModel):
+    """Validated word mapping/deletion form parameters."""
+    mappings: Dict[str, str] = {}
+    deletions: List[str] = []
+
+
+def parse_word_config(
+    word_mappings: str = Form("{}"),
+    delete_words: str = Form("[]"),
+) -> WordConfig:
+    """
+    Parse the word_mappings/delete_words JSON form params into a typed model.
+
+    Runs as a dependency so malformed payloads are rejected with a 400
+    before any upload parsing or analysis work starts.
+    """
+    try:
+        return WordConfig(
+            mappings=orjson.loads(word_mappings),
+            deletions=orjson.loads(delete_words),
+        )
+    except (orjson.JSONDecodeError, ValidationError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid word_mappings/delete_words: {e}"
+        )
+
+
+def _read_xlsx(src: io.BytesIO, **kwargs) -> pd.DataFrame:
+    """
+    Read an xlsx buffer, preferring the calamine engine.
+
+    calamine is a Rust parser roughly an order of magnitude faster than
+    openpyxl on large workbooks; fall back to the default engine when the
+    wheel is not installed.
+    """
+    try:
+        return pd.read_excel(src, engine='calamine', **kwargs)
+    except ImportError:
+        src.seek(0)
+        return pd.read_excel(src, **kwargs)
+
+
+def _read_xlsx_stream(fileobj, **kwargs) -> pd.DataFrame:
+    """Read an xlsx upload stream (calamine with openpyxl fallback)."""
+    return _read_xlsx(io.BytesIO(fileobj.read()), **kwargs)
+
+
+def _read_xls_stream(fileobj, **kwargs) -> pd.DataFrame:
+    """Read a legacy xls upload stream via xlrd."""
+    return pd.read_excel(io.BytesIO(fileobj.read()), **kwargs)
+
+
+# Per-suffix readers with their fast-path options pre-bound, so the
+# parse path is a single dict lookup instead of an if/elif chain
+_READERS = {
+    '.csv': partial(pd.read_csv, dtype=str, engine='c', na_filter=False),
+    '.tsv': partial(pd.read_csv, sep='\t', dtype=str, engine='c', na_filter=False),
+    '.xlsx': _read_xlsx_stream,
+    '.xls': _read_xls_stream,
+}
+
+
+def _validate_suffix(file: UploadFile) -> str:
+    """Return the upload's suffix, rejecting unsupported types before any I/O."""
+    suffix = os.path.splitext(file.filename)[1].lower()
+    if suffix not in _READERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {suffix}")
+    return suffix
+
+
+async def _hash_upload(file: UploadFile) -> str:
+    """
+    Hash an upload with await-based chunk reads.
+
+    UploadFile.read runs off the event loop, so concurrent uploads
+    interleave on disk I/O instead of serializing behind each other.
+    """
+    hasher = hashlib.sha256()
+    await file.seek(0)
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def read_file_texts(
+    file: UploadFile,
+    text_column: Union[int, str] = 1,
+    digest: Optional[str] = None
+) -> List[str]:
     """
     Read texts from uploaded file.
-    
+
     Args:
         file: Uploaded file
-        text_column: Column index containing text (0-indexed)
-        
+        text_column: Column index (0-indexed) or column name containing text
+        digest: Content hash if already computed (see _hash_upload)
+
     Returns:
         List of text strings
     """
-    # Save to temp file
-    suffix = os.path.splitext(file.filename)[1].lower()
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        content = file.file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-    
+    suffix = _validate_suffix(file)
+    reader = _READERS[suffix]
+
+    # Hash the upload in chunks for the parsed-texts cache. The bytes stay
+    # wherever starlette spooled them (memory for small files, disk for
+    # large) -- no second copy is written
+    if digest is None:
+        hasher = hashlib.sha256()
+        file.file.seek(0)
+        while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+    # Re-submissions of the same file (e.g. preview then analyze, or
+    # tweaking min_frequency) skip the pandas parse entirely
+    cached = get_cached_texts(digest, text_column, suffix)
+    if cached is not None:
+        return cached
+
+    file.file.seek(0)
+
+    # Read based on file type, projecting only the text column so the
+    # parser skips everything else. pandas accepts file-like objects, so
+    # the spooled upload is parsed in place instead of via a temp file.
     try:
-        # Read based on file type
-        if suffix in ['.xlsx', '.xls']:
-            df = pd.read_excel(tmp_path)
-        elif suffix == '.csv':
-            df = pd.read_csv(tmp_path)
-        elif suffix == '.tsv':
-            df = pd.read_csv(tmp_path, sep='\t')
+        if suffix in ('.csv', '.tsv'):
+            # Chunked read caps peak memory at the chunk size: each
+            # frame is dropped once its column is appended to the list.
+            # dtype=str / na_filter=False guarantee strings; empty
+            # cells come back as "", filter those out
+            texts = []
+            for chunk_df in reader(file.file, usecols=[text_column], chunksize=100_000):
+                col = chunk_df.iloc[:, 0].to_numpy(dtype=object, copy=False)
+                texts.extend(t for t in col.tolist() if t)
         else:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {suffix}")
-        
-        # Get text column
-        if text_column >= len(df.columns):
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Column {text_column} not found. File has {len(df.columns)} columns."
-            )
-        
-        texts = df.iloc[:, text_column].dropna().astype(str).tolist()
-        
-        return texts
-    
-    finally:
-        # Clean up temp file
-        os.unlink(tmp_path)
+            # Excel readers don't support chunking; parse in one shot
+            df = reader(file.file, usecols=[text_column])
+            col = df.iloc[:, 0].to_numpy(dtype=object, copy=False)
+            # Self-comparison mask drops NaN (NaN != NaN) without dropna
+            mask = col == col
+            texts = col[mask].astype(str, copy=False).tolist()
+    except (ValueError, IndexError):
+        # usecols out of range
+        raise HTTPException(
+            status_code=400,
+            detail=f"Column {text_column} not found in file."
+        )
+
+    set_cached_texts(digest, text_column, suffix, texts)
+
+    return texts
+
+
+def read_file_texts_chunked(
+    file: UploadFile,
+    text_column: Union[int, str] = 1,
+    chunksize: int = 50_000
+):
+    """
+    Yield texts from a CSV/TSV upload in chunks.
+
+    Keeps peak memory proportional to the chunk size instead of the file
+    size, so co-occurrence counting can start before the whole file is
+    parsed. Only CSV/TSV support chunked reads; Excel callers should use
+    read_file_texts.
+
+    Args:
+        file: Uploaded file
+        text_column: Column index (0-indexed) or column name containing text
+        chunksize: Rows per chunk
+
+    Yields:
+        Lists of text strings
+    """
+    suffix = os.path.splitext(file.filename)[1].lower()
+    if suffix not in ('.csv', '.tsv'):
+        raise ValueError(f"Chunked reading not supported for {suffix}")
+
+    file.file.seek(0)
+    try:
+        reader = pd.read_csv(
+            file.file,
+            sep='\t' if suffix == '.tsv' else ',',
+            usecols=[text_column],
+            dtype=str,
+            engine='c',
+            na_filter=False,
+            chunksize=chunksize
+        )
+        for chunk in reader:
+            col = chunk.iloc[:, 0].to_numpy(dtype=object, copy=False)
+            texts = [t for t in col.tolist() if t]
+            if texts:
+                yield texts
+    except (ValueError, IndexError):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Column {text_column} not found in file."
+        )
+
+
+def _build_network_streaming(
+    builder: NetworkBuilder,
+    file: UploadFile,
+    text_column: Union[int, str],
+    min_frequency: int
+) -> int:
+    """
+    Feed a CSV/TSV upload into a builder chunk by chunk.
+
+    Returns:
+        Number of texts ingested
+    """
+    num_texts = 0
+    for chunk_texts in read_file_texts_chunked(file, text_column):
+        builder.update_counts(chunk_texts)
+        num_texts += len(chunk_texts)
+    builder.finalize_network(min_frequency=min_frequency)
+    return num_texts
+
+
+async def read_file_texts_async(
+    file: UploadFile,
+    text_column: Union[int, str] = 1,
+    digest: Optional[str] = None
+) -> List[str]:
+    """
+    Read texts from an uploaded file on a worker thread.
+
+    Allows multiple files to be parsed concurrently via asyncio.gather
+    without blocking the event loop. The content hash is computed with
+    awaited chunk reads before the parse is handed to a worker thread.
+    Callers that already streamed a hash over the upload (e.g. the
+    multi-group size/cache pass) can pass it to avoid hashing twice.
+    """
+    _validate_suffix(file)
+    if digest is None:
+        digest = await _hash_upload(file)
+    return await run_in_threadpool(read_file_texts, file, text_column, digest)
 
 
 @router.post("/analyze/single")
@@ -118,12 +392,13 @@ async def analyze_single_group(
     file: UploadFile = File(...),
     group_name: str = Form("Group"),
     text_column: int = Form(1),
+    text_column_name: Optional[str] = Form(None),
     min_frequency: int = Form(1),
     cluster_method: str = Form("louvain"),
-    word_mappings: str = Form("{}"),
-    delete_words: str = Form("[]"),
+    word_config: WordConfig = Depends(parse_word_config),
     use_semantic: str = Form("false"),
     semantic_threshold: float = Form(0.5),
+    session_id: Optional[str] = Form(None),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -133,26 +408,22 @@ async def analyze_single_group(
         file: Excel/CSV file with text data
         group_name: Name for this group
         text_column: Column index with text (0-indexed)
+        text_column_name: Column name with text (overrides text_column)
         min_frequency: Minimum word frequency
         cluster_method: Clustering method
-        word_mappings: JSON string of word mappings
-        delete_words: JSON string of words to delete
+        word_config: Parsed word mappings and deletions
         use_semantic: Enable semantic similarity edges
         semantic_threshold: Minimum similarity for semantic edges (0-1)
+        session_id: Opaque client id; re-runs on the same file and word
+            config reuse the tokenized state instead of re-processing
 
     Returns:
         Network analysis results
     """
     try:
         # Parse JSON strings
-        mappings = json.loads(word_mappings)
-        deletions = json.loads(delete_words)
-
-        # Read texts
-        texts = read_file_texts(file, text_column)
-
-        if not texts:
-            raise HTTPException(status_code=400, detail="No texts found in file")
+        mappings = word_config.mappings
+        deletions = word_config.deletions
 
         # Create processor and builder
         processor = TextProcessor(
@@ -163,8 +434,47 @@ async def analyze_single_group(
 
         builder = NetworkBuilder(processor)
 
-        # Build network
-        builder.build_network(texts, min_frequency=min_frequency)
+        # Selecting by name lets the reader project the column without
+        # counting positions (see read_file_texts)
+        column = text_column_name if text_column_name else text_column
+
+        # Build network. CSV/TSV uploads are streamed through the builder
+        # chunk by chunk so large files never materialize the full text list
+        suffix = os.path.splitext(file.filename)[1].lower()
+        if session_id:
+            # Exploratory re-runs (same file, tweaked min_frequency or
+            # cluster_method) skip tokenization via the session cache
+            digest = await _hash_upload(file)
+            state_key = make_session_key(digest, {
+                "text_column": column,
+                "word_mappings": mappings,
+                "delete_words": sorted(deletions),
+            })
+            state = get_session_tokens(session_id, state_key)
+            if state is None:
+                # Reuse the digest computed for the session key so the
+                # upload isn't hashed a second time
+                texts = await read_file_texts_async(file, column, digest=digest)
+                result = await run_in_threadpool(processor.process_texts, texts)
+                state = (result['processed_texts'], result['word_counts'])
+                set_session_tokens(session_id, state_key, state)
+            processed_texts, word_counts = state
+            num_texts = len(processed_texts)
+            await run_in_threadpool(
+                builder.build_network_processed,
+                processed_texts, word_counts, min_frequency=min_frequency
+            )
+        elif suffix in ('.csv', '.tsv'):
+            num_texts = await run_in_threadpool(
+                _build_network_streaming, builder, file, column, min_frequency
+            )
+        else:
+            texts = await read_file_texts_async(file, column)
+            num_texts = len(texts)
+            await run_in_threadpool(builder.build_network, texts, min_frequency=min_frequency)
+
+        if num_texts == 0:
+            raise HTTPException(status_code=400, detail="No texts found in file")
 
         # Add semantic edges if enabled
         use_semantic_bool = use_semantic.lower() == "true"
@@ -191,7 +501,7 @@ async def analyze_single_group(
             "nodes": nodes,
             "edges": edges,
             "stats": stats,
-            "num_texts": len(texts),
+            "num_texts": num_texts,
             "semantic_enabled": use_semantic_bool,
             "semantic_edges_added": semantic_edges_added
         }
@@ -208,11 +518,12 @@ async def analyze_comparison(
     group_b_name: str = Form("Group B"),
     text_column_a: int = Form(1),
     text_column_b: int = Form(1),
+    text_column_name_a: Optional[str] = Form(None),
+    text_column_name_b: Optional[str] = Form(None),
     min_frequency: int = Form(1),
     min_score_threshold: float = Form(2.0),
     cluster_method: str = Form("louvain"),
-    word_mappings: str = Form("{}"),
-    delete_words: str = Form("[]"),
+    word_config: WordConfig = Depends(parse_word_config),
     use_semantic: str = Form("false"),
     semantic_threshold: float = Form(0.5),
     current_user: TokenData = Depends(get_current_user)
@@ -227,11 +538,12 @@ async def analyze_comparison(
         group_b_name: Name for group B
         text_column_a: Column index with text for group A (0-indexed)
         text_column_b: Column index with text for group B (0-indexed)
+        text_column_name_a: Column name for group A (overrides text_column_a)
+        text_column_name_b: Column name for group B (overrides text_column_b)
         min_frequency: Minimum word frequency
         min_score_threshold: Minimum normalized score threshold
         cluster_method: Clustering method
-        word_mappings: JSON string of word mappings
-        delete_words: JSON string of words to delete
+        word_config: Parsed word mappings and deletions
         use_semantic: Enable semantic similarity edges
         semantic_threshold: Minimum similarity for semantic edges (0-1)
 
@@ -239,17 +551,18 @@ async def analyze_comparison(
         Comparison analysis results
     """
     try:
-        start_time = time.time()
+        timer = _StageTimer("/analyze/compare")
 
         # Parse JSON strings
-        mappings = json.loads(word_mappings)
-        deletions = json.loads(delete_words)
-
-        # Read texts from both files
-        t1 = time.time()
-        texts_a = read_file_texts(file_a, text_column_a)
-        texts_b = read_file_texts(file_b, text_column_b)
-        print(f"[TIMING] File reading: {time.time() - t1:.2f}s")
+        mappings = word_config.mappings
+        deletions = word_config.deletions
+
+        # Read texts from both files concurrently
+        with timer.stage("read"):
+            texts_a, texts_b = await asyncio.gather(
+                read_file_texts_async(file_a, text_column_name_a or text_column_a),
+                read_file_texts_async(file_b, text_column_name_b or text_column_b)
+            )
 
         if not texts_a:
             raise HTTPException(status_code=400, detail=f"No texts found in {group_a_name} file")
@@ -266,33 +579,35 @@ async def analyze_comparison(
         )
 
         # Run analysis
-        t2 = time.time()
-        results = analyzer.analyze(
-            texts_a=texts_a,
-            texts_b=texts_b,
-            min_frequency=min_frequency,
-            min_score_threshold=min_score_threshold,
-            cluster_method=cluster_method
-        )
-        print(f"[TIMING] Co-occurrence analysis: {time.time() - t2:.2f}s")
+        with timer.stage("network"):
+            results = await run_in_threadpool(
+                analyzer.analyze,
+                texts_a=texts_a,
+                texts_b=texts_b,
+                min_frequency=min_frequency,
+                min_score_threshold=min_score_threshold,
+                cluster_method=cluster_method
+            )
 
         # Add semantic edges if enabled
         use_semantic_bool = use_semantic.lower() == "true"
         semantic_edges_added = 0
         if use_semantic_bool:
-            t3 = time.time()
-            semantic_analyzer = get_semantic_analyzer()
-            # Add semantic edges to both group networks
-            semantic_edges_added += analyzer.builder_a.add_semantic_edges(
-                semantic_analyzer, threshold=semantic_threshold
-            )
-            semantic_edges_added += analyzer.builder_b.add_semantic_edges(
-                semantic_analyzer, threshold=semantic_threshold
-            )
-            print(f"[TIMING] Semantic analysis: {time.time() - t3:.2f}s")
+            with timer.stage("semantic"):
+                semantic_analyzer = get_semantic_analyzer()
+                # One encode + one similarity matrix over the combined
+                # vocabulary, then scatter each group's edges back
+                edges_a, edges_b = semantic_analyzer.get_semantic_edges_multi(
+                    [
+                        list(analyzer.builder_a.graph.nodes()) if analyzer.builder_a.graph else [],
+                        list(analyzer.builder_b.graph.nodes()) if analyzer.builder_b.graph else []
+                    ],
+                    threshold=semantic_threshold
+                )
+                semantic_edges_added += analyzer.builder_a.apply_semantic_edges(edges_a)
+                semantic_edges_added += analyzer.builder_b.apply_semantic_edges(edges_b)
 
-        total_time = time.time() - start_time
-        print(f"[TIMING] Total: {total_time:.2f}s")
+        total_time = timer.log()
 
         return {
             "success": True,
@@ -301,7 +616,7 @@ async def analyze_comparison(
             "num_texts_b": len(texts_b),
             "semantic_enabled": use_semantic_bool,
             "semantic_edges_added": semantic_edges_added,
-            "processing_time": round(total_time, 2)
+            "processing_time": total_time
         }
 
     except Exception as e:
@@ -314,16 +629,12 @@ async def analyze_multi_group(
     min_frequency: int = Form(1),
     min_score_threshold: float = Form(2.0),
     cluster_method: str = Form("louvain"),
-    word_mappings: str = Form("{}"),
-    delete_words: str = Form("[]"),
+    word_config: WordConfig = Depends(parse_word_config),
     use_semantic: str = Form("false"),
     semantic_threshold: float = Form(0.5),
     unify_plurals: str = Form("true"),
-    file_0: UploadFile = File(None),
-    file_1: UploadFile = File(None),
-    file_2: UploadFile = File(None),
-    file_3: UploadFile = File(None),
-    file_4: UploadFile = File(None),
+    stream: str = Form("false"),
+    files: List[UploadFile] = File(...),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -334,31 +645,42 @@ async def analyze_multi_group(
         min_frequency: Minimum word frequency
         min_score_threshold: Minimum normalized score threshold
         cluster_method: Clustering method
-        word_mappings: JSON string of word mappings
-        delete_words: JSON string of words to delete
+        word_config: Parsed word mappings and deletions
         use_semantic: Enable semantic similarity edges
         semantic_threshold: Minimum similarity for semantic edges (0-1)
-        file_0 to file_4: Uploaded files for each group
+        stream: Stream pipeline progress as NDJSON instead of one dict
+        files: Uploaded files, one per group in config order
 
     Returns:
-        Analysis results for all groups
+        Analysis results for all groups, or an NDJSON stream of stage
+        events ending with the full result when stream=true
     """
     try:
-        start_time = time.time()
+        timer = _StageTimer("/analyze/multi")
 
         # Parse configurations
-        configs = json.loads(group_configs)
-        mappings = json.loads(word_mappings)
-        deletions = json.loads(delete_words)
+        configs = orjson.loads(group_configs)
+        mappings = word_config.mappings
+        deletions = word_config.deletions
         use_semantic_bool = use_semantic.lower() == "true"
         unify_plurals_bool = unify_plurals.lower() == "true"
+        stream_bool = stream.lower() == "true"
 
         # ============================================================
         # USAGE LIMIT CHECKS
         # ============================================================
 
+        # One profile read covers all the limit checks, evaluated in the
+        # same precedence order as before
+        num_groups = len(configs)
+        check_bundle = await check_analysis_bundle(
+            current_user.user_id, num_groups, use_semantic_bool
+        )
+        analysis_limit = check_bundle["analysis"]
+        groups_limit = check_bundle["groups"]
+        semantic_check = check_bundle["semantic"]
+
         # Check daily analysis limit
-        analysis_limit = await check_analysis_limit(current_user.user_id)
         if not analysis_limit.get("allowed"):
             raise HTTPException(
                 status_code=403,
@@ -373,8 +695,6 @@ async def analyze_multi_group(
             )
 
         # Check groups limit
-        num_groups = len(configs)
-        groups_limit = await check_groups_limit(current_user.user_id, num_groups)
         if not groups_limit.get("allowed"):
             raise HTTPException(
                 status_code=403,
@@ -389,18 +709,16 @@ async def analyze_multi_group(
             )
 
         # Check semantic feature access
-        if use_semantic_bool:
-            semantic_check = await check_semantic_enabled(current_user.user_id)
-            if not semantic_check.get("allowed"):
-                raise HTTPException(
-                    status_code=403,
-                    detail={
-                        "error": "feature_disabled",
-                        "type": "semantic_disabled",
-                        "message": semantic_check.get("message"),
-                        "tier": semantic_check.get("tier")
-                    }
-                )
+        if semantic_check is not None and not semantic_check.get("allowed"):
+            raise HTTPException(
+                status_code=403,
+                detail={
+                    "error": "feature_disabled",
+                    "type": "semantic_disabled",
+                    "message": semantic_check.get("message"),
+                    "tier": semantic_check.get("tier")
+                }
+            )
 
         # Get tier limits for word count check
         tier = analysis_limit.get("tier", "free")
@@ -412,10 +730,6 @@ async def analyze_multi_group(
         # END LIMIT CHECKS
         # ============================================================
 
-        # Collect files in order
-        all_files = [file_0, file_1, file_2, file_3, file_4]
-        files = [f for f in all_files[:len(configs)] if f is not None]
-
         if len(files) != len(configs):
             raise HTTPException(
                 status_code=400,
@@ -425,13 +739,39 @@ async def analyze_multi_group(
         if len(files) == 0:
             raise HTTPException(status_code=400, detail="At least one file is required")
 
-        # Read file contents for size checks and cache keys
-        file_contents = []
+        def _size_exceeded(index: int, file_size: int) -> HTTPException:
+            return HTTPException(
+                status_code=403,
+                detail={
+                    "error": "limit_exceeded",
+                    "type": "file_size",
+                    "message": f"File {index+1} exceeds size limit ({limits.get('max_file_size_mb')} MB). Upgrade for larger files.",
+                    "tier": tier,
+                    "max_size_mb": limits.get("max_file_size_mb"),
+                    "file_size_mb": round(file_size / (1024 * 1024), 2)
+                }
+            )
+
+        # Reject oversize uploads from the multipart-reported size before
+        # touching any bytes; the streamed hash loop below re-verifies in
+        # case the reported size is missing or wrong
+        for i, file in enumerate(files):
+            if file.size and file.size > max_file_size:
+                raise _size_exceeded(i, file.size)
+
+        # Hash uploads in streamed chunks so no full copy of any file is
+        # ever held in memory, aborting mid-stream on oversize
         file_hashes = []
         for i, file in enumerate(files):
-            content = await file.read()
-            file_contents.append(content)
-            file_hashes.append(hash_content(content))
+            hasher = hashlib.sha256()
+            size = 0
+            await file.seek(0)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                size += len(chunk)
+                if size > max_file_size:
+                    raise _size_exceeded(i, size)
+            file_hashes.append(hasher.hexdigest())
             await file.seek(0)
 
         # Check cache
@@ -450,132 +790,151 @@ async def analyze_multi_group(
         if cached_result is not None:
             # Increment usage counter even for cached results
             await increment_analysis_count(current_user.user_id)
+            if stream_bool:
+                # Streaming clients expect NDJSON stage lines ending in a
+                # done stage, even on a warm cache
+                async def cached_stream():
+                    yield orjson.dumps({"stage": "done", "result": cached_result}) + b"\n"
+
+                return StreamingResponse(cached_stream(), media_type="application/x-ndjson")
             return cached_result
 
-        # Check file sizes against tier limit
-        for i, content in enumerate(file_contents):
-            file_size = len(content)
+        async def run_stages():
+            """Yield pipeline progress dicts; the last one carries the result."""
+            # Read texts from all files concurrently
+            with timer.stage("read"):
+                # The size/cache pass above already hashed every upload, so
+                # the reads reuse those digests instead of hashing again
+                texts_list = list(await asyncio.gather(*[
+                    read_file_texts_async(
+                        file,
+                        config.get('text_column_name') or config.get('text_column', 1),
+                        digest=digest
+                    )
+                    for file, config, digest in zip(files, configs, file_hashes)
+                ]))
+
+                group_names = []
+                total_words = 0
+
+                for i, (texts, config) in enumerate(zip(texts_list, configs)):
+                    if not texts:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"No texts found in file for group {config.get('name', f'Group {i+1}')}"
+                        )
+                    group_names.append(config.get('name', f'Group {i+1}'))
+
+                    # Count words for limit checking with one vectorized regex
+                    # pass instead of a Python-level split per row
+                    total_words += int(pd.Series(texts, dtype=object).str.count(r'\S+').sum())
+
+            yield {
+                "stage": "parsed",
+                "num_texts": [len(texts) for texts in texts_list],
+                "elapsed": timer.elapsed()
+            }
 
-            if file_size > max_file_size:
+            # Check word count limit
+            if max_words is not None and total_words > max_words:
                 raise HTTPException(
                     status_code=403,
                     detail={
                         "error": "limit_exceeded",
-                        "type": "file_size",
-                        "message": f"File {i+1} exceeds size limit ({limits.get('max_file_size_mb')} MB). Upgrade for larger files.",
+                        "type": "word_limit",
+                        "message": f"Total words ({total_words}) exceeds limit ({max_words}). Upgrade for higher limits.",
                         "tier": tier,
-                        "max_size_mb": limits.get("max_file_size_mb"),
-                        "file_size_mb": round(file_size / (1024 * 1024), 2)
+                        "max_words": max_words,
+                        "total_words": total_words
                     }
                 )
 
-        # Reset file positions after content reads
-        for file in files:
-            await file.seek(0)
-
-        # Read texts from all files
-        t1 = time.time()
-        texts_list = []
-        group_names = []
-        total_words = 0
-
-        for i, (file, config) in enumerate(zip(files, configs)):
-            text_column = config.get('text_column', 1)
-            texts = read_file_texts(file, text_column)
-            if not texts:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"No texts found in file for group {config.get('name', f'Group {i+1}')}"
-                )
-            texts_list.append(texts)
-            group_names.append(config.get('name', f'Group {i+1}'))
-
-            # Count words for limit checking
-            for text in texts:
-                total_words += len(str(text).split())
-
-        print(f"[TIMING] File reading: {time.time() - t1:.2f}s")
-
-        # Check word count limit
-        if max_words is not None and total_words > max_words:
-            raise HTTPException(
-                status_code=403,
-                detail={
-                    "error": "limit_exceeded",
-                    "type": "word_limit",
-                    "message": f"Total words ({total_words}) exceeds limit ({max_words}). Upgrade for higher limits.",
-                    "tier": tier,
-                    "max_words": max_words,
-                    "total_words": total_words
-                }
+            # Extract per-group min score thresholds (fallback to global)
+            per_group_thresholds = []
+            for config in configs:
+                threshold = config.get('min_score_threshold', min_score_threshold)
+                per_group_thresholds.append(float(threshold))
+
+            # Create multi-group analyzer
+            analyzer = MultiGroupAnalyzer(
+                group_names=group_names,
+                word_mappings=mappings,
+                delete_words=set(deletions),
+                unify_plurals=unify_plurals_bool
             )
 
-        # Extract per-group min score thresholds (fallback to global)
-        per_group_thresholds = []
-        for config in configs:
-            threshold = config.get('min_score_threshold', min_score_threshold)
-            per_group_thresholds.append(float(threshold))
-
-        # Create multi-group analyzer
-        analyzer = MultiGroupAnalyzer(
-            group_names=group_names,
-            word_mappings=mappings,
-            delete_words=set(deletions),
-            unify_plurals=unify_plurals_bool
-        )
-
-        # Run analysis
-        t2 = time.time()
-        results = analyzer.analyze(
-            texts_list=texts_list,
-            min_frequency=min_frequency,
-            min_score_threshold=min_score_threshold,
-            per_group_thresholds=per_group_thresholds,
-            cluster_method=cluster_method
-        )
-        print(f"[TIMING] Co-occurrence analysis: {time.time() - t2:.2f}s")
-
-        # Add semantic edges if enabled
-        use_semantic_bool = use_semantic.lower() == "true"
-        semantic_edges_added = 0
-        if use_semantic_bool:
-            t3 = time.time()
-            semantic_analyzer = get_semantic_analyzer()
-            for builder in analyzer.builders:
-                semantic_edges_added += builder.add_semantic_edges(
-                    semantic_analyzer, threshold=semantic_threshold
+            # Run analysis
+            with timer.stage("network"):
+                results = await run_in_threadpool(
+                    analyzer.analyze,
+                    texts_list=texts_list,
+                    min_frequency=min_frequency,
+                    min_score_threshold=min_score_threshold,
+                    per_group_thresholds=per_group_thresholds,
+                    cluster_method=cluster_method
                 )
-            print(f"[TIMING] Semantic analysis: {time.time() - t3:.2f}s")
+            yield {"stage": "network", "elapsed": timer.elapsed()}
 
-        total_time = time.time() - start_time
-        print(f"[TIMING] Total: {total_time:.2f}s")
+            # Add semantic edges if enabled (flag already parsed above)
+            semantic_edges_added = 0
+            if use_semantic_bool:
+                with timer.stage("semantic"):
+                    semantic_analyzer = get_semantic_analyzer()
+                    semantic_edges_added = analyzer.add_semantic_edges_bulk(
+                        semantic_analyzer, threshold=semantic_threshold
+                    )
+                yield {"stage": "semantic", "elapsed": timer.elapsed()}
 
-        # Build response with text counts
-        num_texts = {f"num_texts_{analyzer.group_keys[i]}": len(texts_list[i]) for i in range(len(texts_list))}
+            total_time = timer.log()
 
-        # Increment usage counter after successful analysis
-        await increment_analysis_count(current_user.user_id)
+            # Build response with text counts
+            num_texts = {f"num_texts_{analyzer.group_keys[i]}": len(texts_list[i]) for i in range(len(texts_list))}
 
-        # Log usage for analytics
-        await log_usage(current_user.user_id, "analysis", {
-            "num_groups": len(group_names),
-            "total_words": total_words,
-            "semantic_enabled": use_semantic_bool,
-            "processing_time": round(total_time, 2)
-        })
+            # Increment usage counter after successful analysis
+            await increment_analysis_count(current_user.user_id)
 
-        response_data = {
-            "success": True,
-            **results,
-            **num_texts,
-            "semantic_enabled": use_semantic_bool,
-            "semantic_edges_added": semantic_edges_added,
-            "processing_time": round(total_time, 2)
-        }
+            # Log usage for analytics
+            _log_usage_background(current_user.user_id, "analysis", {
+                "num_groups": len(group_names),
+                "total_words": total_words,
+                "semantic_enabled": use_semantic_bool,
+                "processing_time": total_time
+            })
 
-        # Store in cache
-        set_cached(file_hashes, cache_config, response_data)
+            response_data = {
+                "success": True,
+                **results,
+                **num_texts,
+                "semantic_enabled": use_semantic_bool,
+                "semantic_edges_added": semantic_edges_added,
+                "processing_time": total_time
+            }
 
+            # Store in cache
+            set_cached(file_hashes, cache_config, response_data)
+
+            yield {"stage": "done", "result": response_data}
+
+        if stream_bool:
+            # Progressive NDJSON: one line per pipeline stage, so the
+            # client gets its first byte after parsing instead of after
+            # the whole pipeline. Errors past the pre-checks arrive as
+            # an error stage since headers are already sent.
+            async def ndjson_stream():
+                try:
+                    async for stage in run_stages():
+                        yield orjson.dumps(stage) + b"\n"
+                except HTTPException as e:
+                    yield orjson.dumps({"stage": "error", "detail": e.detail}) + b"\n"
+                except Exception as e:
+                    yield orjson.dumps({"stage": "error", "detail": str(e)}) + b"\n"
+
+            return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+        response_data = None
+        async for stage in run_stages():
+            if stage.get("stage") == "done":
+                response_data = stage["result"]
         return response_data
 
     except HTTPException:
@@ -592,8 +951,8 @@ async def analyze_word_pairs(
     group_a_name: str = Form("Group A"),
     group_b_name: str = Form("Group B"),
     text_column: int = Form(1),
-    word_mappings: str = Form("{}"),
-    delete_words: str = Form("[]"),
+    text_column_name: Optional[str] = Form(None),
+    word_config: WordConfig = Depends(parse_word_config),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -604,12 +963,15 @@ async def analyze_word_pairs(
     """
     try:
         # Parse JSON strings
-        mappings = json.loads(word_mappings)
-        deletions = json.loads(delete_words)
+        mappings = word_config.mappings
+        deletions = word_config.deletions
         
-        # Read texts
-        texts_a = read_file_texts(file_a, text_column)
-        texts_b = read_file_texts(file_b, text_column)
+        # Read both files concurrently on worker threads
+        column = text_column_name if text_column_name else text_column
+        texts_a, texts_b = await asyncio.gather(
+            read_file_texts_async(file_a, column),
+            read_file_texts_async(file_b, column)
+        )
         
         # Create analyzer
         analyzer = ComparisonAnalyzer(
@@ -621,7 +983,7 @@ async def analyze_word_pairs(
         )
         
         # Get word pairs
-        pairs = analyzer.get_word_pairs(texts_a, texts_b)
+        pairs = await run_in_threadpool(analyzer.get_word_pairs, texts_a, texts_b)
         
         return {
             "success": True,
@@ -647,55 +1009,114 @@ async def get_default_stopwords(
 async def preview_file(
     file: UploadFile = File(...),
     text_column: int = Form(1),
+    text_column_name: Optional[str] = Form(None),
     num_rows: int = Form(5),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Preview uploaded file contents.
-    
+
     Args:
         file: Uploaded file
         text_column: Column index to preview
+        text_column_name: Column name to preview (overrides text_column)
         num_rows: Number of rows to preview
         
     Returns:
         Preview of file contents
     """
     try:
-        suffix = os.path.splitext(file.filename)[1].lower()
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = file.file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        try:
-            if suffix in ['.xlsx', '.xls']:
-                df = pd.read_excel(tmp_path)
-            elif suffix == '.csv':
-                df = pd.read_csv(tmp_path)
-            elif suffix == '.tsv':
-                df = pd.read_csv(tmp_path, sep='\t')
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported file type: {suffix}")
-            
-            return {
-                "success": True,
-                "filename": file.filename,
-                "num_rows": len(df),
-                "num_columns": len(df.columns),
-                "columns": list(df.columns),
-                "preview": df.head(num_rows).to_dict(orient='records'),
-                "text_column_preview": df.iloc[:num_rows, text_column].tolist() if text_column < len(df.columns) else []
-            }
-        
-        finally:
-            os.unlink(tmp_path)
+        column = text_column_name if text_column_name else text_column
+        return await run_in_threadpool(_parse_preview, file, column, num_rows)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _column_preview(df: pd.DataFrame, text_column: Union[int, str], num_rows: int) -> List[Any]:
+    """Extract the preview values of the text column by index or name."""
+    if isinstance(text_column, str):
+        if text_column not in df.columns:
+            return []
+        return df[text_column].head(num_rows).tolist()
+    if text_column >= len(df.columns):
+        return []
+    return df.iloc[:num_rows, text_column].tolist()
+
+
+def _count_csv_rows(fileobj, sep: str = ',') -> int:
+    """Count data rows in a CSV/TSV stream without materializing cells.
+
+    Raw newline counting would overcount quoted fields with embedded
+    newlines — common in survey free text — so this runs the quote-aware
+    C parser over just the first column in chunks, which stays cheap
+    while matching the exact parsed record count.
+    """
+    fileobj.seek(0)
+    try:
+        reader = pd.read_csv(
+            fileobj, sep=sep, usecols=[0], dtype=str,
+            na_filter=False, engine='c', chunksize=65536
+        )
+        return sum(len(chunk) for chunk in reader)
+    except pd.errors.EmptyDataError:
+        return 0
+
+
+def _xlsx_row_count(src: io.BytesIO) -> Optional[int]:
+    """Get the data row count of an xlsx from sheet metadata only."""
+    try:
+        import openpyxl
+        src.seek(0)
+        wb = openpyxl.load_workbook(src, read_only=True)
+        max_row = wb.active.max_row or 0
+        wb.close()
+        return max(max_row - 1, 0)  # exclude header
+    except Exception:
+        return None
+
+
+def _parse_preview(file: UploadFile, text_column: Union[int, str], num_rows: int) -> Dict[str, Any]:
+    """Blocking preview parse, run on a worker thread.
+
+    Parses only the first num_rows rows; row totals come from cheap
+    metadata/newline counts rather than a full parse.
+    """
+    suffix = os.path.splitext(file.filename)[1].lower()
+    file.file.seek(0)
+
+    if suffix == '.xlsx':
+        src = io.BytesIO(file.file.read())
+        df = _read_xlsx(src, nrows=num_rows)
+        total_rows = _xlsx_row_count(src)
+    elif suffix == '.xls':
+        # xlrd parses the whole file regardless, so totals are exact
+        df_full = pd.read_excel(io.BytesIO(file.file.read()))
+        total_rows = len(df_full)
+        df = df_full.head(num_rows)
+    elif suffix in ('.csv', '.tsv'):
+        df = pd.read_csv(
+            file.file,
+            sep='\t' if suffix == '.tsv' else ',',
+            nrows=num_rows
+        )
+        total_rows = _count_csv_rows(file.file, sep='\t' if suffix == '.tsv' else ',')
+    else:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {suffix}")
+
+    return {
+        "success": True,
+        "filename": file.filename,
+        "num_rows": total_rows if total_rows is not None else len(df),
+        "num_columns": len(df.columns),
+        "columns": list(df.columns),
+        "preview": df.head(num_rows).to_dict(orient='records'),
+        "text_column_preview": _column_preview(df, text_column, num_rows)
+    }
+
+
 class ChatRequest(BaseModel):
     """Chat request model."""
     message: str
@@ -747,17 +1168,54 @@ async def chat_about_analysis(
                 "history": request.conversation_history or []
             }
 
-        # Prepare efficient context
-        context = chat_service.prepare_context(
-            analysis_data=request.analysis_data,
-            stats=request.stats,
-            group_names=request.group_names,
-            group_keys=request.group_keys,
-            max_words=30  # Limit for cost efficiency
+        # Prepare efficient context; later turns of the same conversation
+        # reuse the cached string instead of rebuilding it per message
+        analysis_digest = make_context_key(
+            request.analysis_data, request.stats,
+            request.group_names, request.group_keys
         )
+        context = get_cached_context(analysis_digest)
+        if context is None:
+            context = chat_service.prepare_context(
+                analysis_data=request.analysis_data,
+                stats=request.stats,
+                group_names=request.group_names,
+                group_keys=request.group_keys,
+                max_words=30  # Limit for cost efficiency
+            )
+            set_cached_context(analysis_digest, context)
+
+        # Semantically similar repeat questions about the same analysis
+        # are answered from cache without an OpenAI round trip
+        context_key = hashlib.sha256(context.encode()).hexdigest()
+        message_embedding = None
+        try:
+            semantic_analyzer = get_semantic_analyzer()
+            message_embedding = (await run_in_threadpool(
+                semantic_analyzer.get_embeddings, [request.message]
+            ))[0]
+            cached_response = get_cached_chat(context_key, message_embedding)
+        except Exception as e:
+            print(f"[CHAT CACHE] Lookup failed, calling LLM: {e}")
+            cached_response = None
+
+        if cached_response is not None:
+            # Count cached answers like the multi-group result cache does
+            await increment_chat_count(current_user.user_id)
+            updated_chat_limit = await check_chat_limit(current_user.user_id)
+            return {
+                "success": True,
+                "response": cached_response,
+                "history": (request.conversation_history or []) + [
+                    {"role": "user", "content": request.message},
+                    {"role": "assistant", "content": cached_response}
+                ],
+                "tokens_used": 0,
+                "chat_remaining": updated_chat_limit.get("remaining")
+            }
 
         # Get response
-        result = chat_service.chat(
+        result = await chat_service.chat(
             message=request.message,
             context=context,
             conversation_history=request.conversation_history
@@ -771,11 +1229,14 @@ async def chat_about_analysis(
                 "history": result.get("history", [])
             }
 
+        if message_embedding is not None:
+            set_cached_chat(context_key, message_embedding, result["response"])
+
         # Increment chat count after successful response
         await increment_chat_count(current_user.user_id)
 
         # Log usage
-        await log_usage(current_user.user_id, "chat", {
+        _log_usage_background(current_user.user_id, "chat", {
             "tokens_used": result.get("tokens_used", 0)
         })
 
@@ -818,19 +1279,23 @@ async def chat_status(
 
 @router.get("/user/profile")
 async def get_profile(
+    response: Response,
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Get user profile with tier info, usage stats, and limits.
     """
-    profile = await get_user_profile(current_user.user_id)
+    # Private so shared caches never store it; a few seconds of browser
+    # caching dedupes the fan-out of a single page render
+    response.headers["Cache-Control"] = "private, max-age=5"
+    # One profile read; the limit statuses derive from the same row
+    bundle = await get_profile_bundle(current_user.user_id)
+    profile = bundle["profile"]
+    analysis_status = bundle["analysis_status"]
+    chat_status = bundle["chat_status"]
     tier = profile.get("tier", "free")
     limits = get_tier_limits(tier)
 
-    # Get current usage status
-    analysis_status = await check_analysis_limit(current_user.user_id)
-    chat_status = await check_chat_limit(current_user.user_id)
-
     return {
         "id": current_user.user_id,
         "email": current_user.email,
@@ -847,21 +1312,37 @@ async def get_profile(
     }
 
 
+# Tier limits are constants: serialize them once at import time and let
+# repeat clients revalidate with an ETag instead of refetching the body
+_LIMITS_JSON = orjson.dumps({"tiers": TIER_LIMITS, "pricing": TIER_PRICING})
+_LIMITS_ETAG = f'"{hashlib.sha256(_LIMITS_JSON).hexdigest()[:16]}"'
+
+
 @router.get("/user/limits")
 async def get_limits(
+    request: Request,
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Get all tier limits for display in UI.
     """
-    return {
-        "tiers": TIER_LIMITS,
-        "pricing": TIER_PRICING
-    }
+    if request.headers.get("if-none-match") == _LIMITS_ETAG:
+        return Response(status_code=304)
+    return Response(
+        content=_LIMITS_JSON,
+        media_type="application/json",
+        headers={
+            "ETag": _LIMITS_ETAG,
+            # s-maxage lets a CDN/reverse proxy absorb repeat hits;
+            # stale-while-revalidate keeps serving during refresh
+            "Cache-Control": "public, max-age=86400, s-maxage=3600, stale-while-revalidate=600"
+        }
+    )
 
 
 @router.get("/user/check-analysis")
 async def check_analysis(
+    response: Response,
     groups: int = 1,
     use_semantic: bool = False,
     current_user: TokenData = Depends(get_current_user)
@@ -869,8 +1350,15 @@ async def check_analysis(
     """
     Pre-check if an analysis would be allowed before running it.
     """
+    response.headers["Cache-Control"] = "private, max-age=5"
+    # One profile read covers all three checks, evaluated in the same
+    # precedence order as before
+    bundle = await check_analysis_bundle(current_user.user_id, groups, use_semantic)
+    analysis_limit = bundle["analysis"]
+    groups_limit = bundle["groups"]
+    semantic_check = bundle["semantic"]
+
     # Check daily limit
-    analysis_limit = await check_analysis_limit(current_user.user_id)
     if not analysis_limit.get("allowed"):
         return {
             "allowed": False,
@@ -879,7 +1367,6 @@ async def check_analysis(
         }
 
     # Check groups limit
-    groups_limit = await check_groups_limit(current_user.user_id, groups)
     if not groups_limit.get("allowed"):
         return {
             "allowed": False,
@@ -888,14 +1375,12 @@ async def check_analysis(
         }
 
     # Check semantic access
-    if use_semantic:
-        semantic_check = await check_semantic_enabled(current_user.user_id)
-        if not semantic_check.get("allowed"):
-            return {
-                "allowed": False,
-                "reason": "semantic_disabled",
-                **semantic_check
-            }
+    if semantic_check is not None and not semantic_check.get("allowed"):
+        return {
+            "allowed": False,
+            "reason": "semantic_disabled",
+            **semantic_check
+        }
 
     return {
         "allowed": True,
@@ -948,29 +1433,31 @@ async def export_analysis(
 
     fmt = request.format.lower()
     try:
+        # The exporters are CPU-bound (openpyxl, networkx XML writers);
+        # run them in the threadpool so the event loop keeps serving
         if fmt == "excel":
-            data = export_excel(request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
+            data = await run_in_threadpool(export_excel, request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
             return Response(
                 content=data,
                 media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 headers={"Content-Disposition": "attachment; filename=analysis.xlsx"}
             )
         elif fmt == "json":
-            data = export_json(request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
+            data = await run_in_threadpool(export_json, request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
             return Response(
                 content=data,
                 media_type="application/json",
                 headers={"Content-Disposition": "attachment; filename=analysis.json"}
             )
         elif fmt == "graphml":
-            data = export_graphml(request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
+            data = await run_in_threadpool(export_graphml, request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
             return Response(
                 content=data,
                 media_type="application/xml",
                 headers={"Content-Disposition": "attachment; filename=analysis.graphml"}
             )
         elif fmt == "gexf":
-            data = export_gexf(request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
+            data = await run_in_threadpool(export_gexf, request.nodes, request.edges, request.stats, request.group_names, request.group_keys)
             return Response(
                 content=data,
                 media_type="application/xml",
@@ -1018,7 +1505,7 @@ async def update_tier_direct(
         raise HTTPException(status_code=500, detail="Failed to update tier")
 
     # Log the tier change
-    await log_usage(current_user.user_id, "tier_changed", {"new_tier": request.tier})
+    _log_usage_background(current_user.user_id, "tier_changed", {"new_tier": request.tier})
 
     return {"success": True, "tier": request.tier}
 
@@ -1049,7 +1536,7 @@ async def create_checkout(
         )
 
     # Log the checkout attempt
-    await log_usage(current_user.user_id, "checkout_started", {"tier": request.tier})
+    _log_usage_background(current_user.user_id, "checkout_started", {"tier": request.tier})
 
     return result
 
@@ -1097,6 +1584,10 @@ async def stripe_webhook(request: Request):
     if not event:
         raise HTTPException(status_code=400, detail="Invalid webhook signature")
 
+    # Stripe retries deliver duplicates; skip the DB writes on a repeat
+    if seen_webhook_event(event.id):
+        return {"status": "duplicate"}
+
     # Handle the event
     event_type = event.type
 
@@ -1110,10 +1601,8 @@ async def stripe_webhook(request: Request):
             customer_id = get_customer_id_from_session(session)
             subscription_id = get_subscription_from_session(session)
 
-            # Update user profile with Stripe IDs and tier
-            await update_stripe_customer(user_id, customer_id, subscription_id)
-            await update_user_tier(user_id, tier)
-            await log_usage(user_id, "subscription_started", {"tier": tier})
+            # One profile write covers the Stripe IDs and the new tier
+            await complete_checkout(user_id, customer_id, subscription_id, tier)
 
             print(f"[STRIPE] User {user_id} upgraded to {tier}")
 
@@ -1121,6 +1610,11 @@ async def stripe_webhook(request: Request):
         subscription = event.data.object
         user_id = subscription.metadata.get("user_id")
 
+        # Updates can arrive out of order during retry bursts; only the
+        # newest event per subscription may change the tier
+        if stale_subscription_event(subscription.id, event.created):
+            return {"status": "stale"}
+
         if user_id:
             # Check subscription status
             if subscription.status == "active":
@@ -1138,7 +1632,7 @@ async def stripe_webhook(request: Request):
 
         if user_id:
             await update_user_tier(user_id, "free")
-            await log_usage(user_id, "subscription_cancelled", {})
+            _log_usage_background(user_id, "subscription_cancelled", {})
             print(f"[STRIPE] User {user_id} subscription cancelled, downgraded to free")
 
     return {"status": "success"}
@@ -1185,7 +1679,7 @@ async def save_analysis_endpoint(
     if not analysis_id:
         raise HTTPException(status_code=500, detail="Failed to save analysis")
 
-    await log_usage(current_user.user_id, "analysis_saved", {"name": request.name})
+    _log_usage_background(current_user.user_id, "analysis_saved", {"name": request.name})
 
     return {
         "success": True,
@@ -1279,32 +1773,55 @@ async def compute_shortest_path(
     """
     Compute shortest path between two nodes using Dijkstra's algorithm.
     """
-    import networkx as nx
+    import numpy as np
+    from scipy import sparse
+    from scipy.sparse.csgraph import dijkstra
 
-    G = nx.Graph()
+    # Map node labels to ints and build a CSR adjacency in one pass; the
+    # C-level Dijkstra replaces per-edge NetworkX graph construction
+    index: Dict[str, int] = {}
     for edge in request.edges:
-        w = edge.get('weight', 1)
-        # Invert weight for Dijkstra (higher weight = shorter distance)
-        G.add_edge(edge['from'], edge['to'], weight=1.0 / max(w, 1))
+        for word in (edge['from'], edge['to']):
+            if word not in index:
+                index[word] = len(index)
 
-    if request.source not in G or request.target not in G:
+    if request.source not in index or request.target not in index:
         raise HTTPException(status_code=400, detail="Source or target node not found in graph")
 
-    try:
-        path = nx.dijkstra_path(G, request.source, request.target, weight='weight')
-        length = nx.dijkstra_path_length(G, request.source, request.target, weight='weight')
-        return {
-            "success": True,
-            "path": path,
-            "length": round(length, 4),
-            "hops": len(path) - 1
-        }
-    except nx.NetworkXNoPath:
+    num_edges = len(request.edges)
+    rows = np.fromiter((index[e['from']] for e in request.edges), dtype=np.intp, count=num_edges)
+    cols = np.fromiter((index[e['to']] for e in request.edges), dtype=np.intp, count=num_edges)
+    weights = np.fromiter((e.get('weight', 1) for e in request.edges), dtype=np.float64, count=num_edges)
+    # Invert weight for Dijkstra (higher weight = shorter distance)
+    inverted = 1.0 / np.maximum(weights, 1.0)
+
+    n = len(index)
+    matrix = sparse.csr_matrix((inverted, (rows, cols)), shape=(n, n))
+
+    src, dst = index[request.source], index[request.target]
+    dist, pred = dijkstra(matrix, directed=False, indices=src, return_predecessors=True)
+
+    if np.isinf(dist[dst]):
         return {
             "success": False,
             "error": f"No path exists between '{request.source}' and '{request.target}'"
         }
 
+    # Walk predecessors back from the target; insertion order of the
+    # index dict doubles as the id -> label mapping
+    labels = list(index)
+    path_ids = [dst]
+    while path_ids[-1] != src:
+        path_ids.append(int(pred[path_ids[-1]]))
+    path = [labels[i] for i in reversed(path_ids)]
+
+    return {
+        "success": True,
+        "path": path,
+        "length": round(float(dist[dst]), 4),
+        "hops": len(path) - 1
+    }
+
 
 @router.post("/ego-network")
 async def compute_ego_network(
@@ -1314,41 +1831,48 @@ async def compute_ego_network(
     """
     Extract ego-network (subgraph) around a center node up to N hops.
     """
-    import networkx as nx
+    import numpy as np
+    from scipy import sparse
 
-    G = nx.Graph()
+    # Same int-id mapping as /shortest-path: one CSR adjacency, then each
+    # hop is a sparse matrix-vector product instead of a Python BFS layer
+    index: Dict[str, int] = {}
     for edge in request.edges:
-        G.add_edge(edge['from'], edge['to'], weight=edge.get('weight', 1))
+        for word in (edge['from'], edge['to']):
+            if word not in index:
+                index[word] = len(index)
 
-    if request.center_word not in G:
+    if request.center_word not in index:
         raise HTTPException(status_code=400, detail=f"Node '{request.center_word}' not found in graph")
 
     hops = max(1, min(request.hops, 3))
 
-    # BFS to find nodes within N hops
-    ego_nodes = set()
-    current_layer = {request.center_word}
+    num_edges = len(request.edges)
+    rows = np.fromiter((index[e['from']] for e in request.edges), dtype=np.intp, count=num_edges)
+    cols = np.fromiter((index[e['to']] for e in request.edges), dtype=np.intp, count=num_edges)
+
+    n = len(index)
+    adjacency = sparse.csr_matrix(
+        (np.ones(num_edges, dtype=np.int32), (rows, cols)), shape=(n, n)
+    )
+    adjacency = adjacency + adjacency.T
+
+    reached = np.zeros(n, dtype=bool)
+    reached[index[request.center_word]] = True
     for _ in range(hops):
-        next_layer = set()
-        for node in current_layer:
-            for neighbor in G.neighbors(node):
-                if neighbor not in ego_nodes and neighbor != request.center_word:
-                    next_layer.add(neighbor)
-        ego_nodes.update(current_layer)
-        current_layer = next_layer
-    ego_nodes.update(current_layer)
-
-    # Filter edges to ego subgraph
-    ego_edges = [
-        e for e in request.edges
-        if e['from'] in ego_nodes and e['to'] in ego_nodes
-    ]
+        reached |= (adjacency @ reached.astype(np.int32)) > 0
+
+    # Filter edges to ego subgraph with one vectorized mask
+    labels = list(index)
+    ego_nodes = [labels[i] for i in np.nonzero(reached)[0]]
+    edge_mask = reached[rows] & reached[cols]
+    ego_edges = [request.edges[i] for i in np.nonzero(edge_mask)[0]]
 
     return {
         "success": True,
         "center": request.center_word,
         "hops": hops,
-        "ego_nodes": list(ego_nodes),
+        "ego_nodes": ego_nodes,
         "ego_edges": ego_edges,
         "num_nodes": len(ego_nodes),
         "num_edges": len(ego_edges)
@@ -2,12 +2,16 @@
 Authentication middleware for Supabase JWT verification.
 """
 
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from typing import Optional
 from pydantic import BaseModel
 
+from cachetools import TTLCache
+
 from .config import settings
 
 
@@ -23,10 +27,19 @@ SUPABASE_JWK = {
     "key_ops": ["verify"]
 }
 
+# Construct the EC public key once at import; passing the raw JWK dict to
+# jwt.decode makes jose rebuild the key object on every verification
+SUPABASE_PUBLIC_KEY = jwk.construct(SUPABASE_JWK, algorithm="ES256")
+
 
 # Security scheme for Bearer token
 security = HTTPBearer(auto_error=False)
 
+# Verified-token cache: repeat requests within a session skip the ES256
+# signature check and claim parsing. Entries keep the token's own exp so
+# a token can never outlive its expiry through the cache.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
 
 class TokenData(BaseModel):
     """Extracted token data."""
@@ -53,11 +66,17 @@ def verify_jwt(token: str) -> TokenData:
             detail="Authentication not configured"
         )
 
+    cached = _token_cache.get(token)
+    if cached is not None:
+        token_data, expires_at = cached
+        if expires_at is None or expires_at > time.time():
+            return token_data
+
     try:
         # Use Supabase JWK public key for ES256 verification
         payload = jwt.decode(
             token,
-            SUPABASE_JWK,
+            SUPABASE_PUBLIC_KEY,
             algorithms=["ES256"],
             audience="authenticated"
         )
@@ -73,7 +92,9 @@ def verify_jwt(token: str) -> TokenData:
         # Extract email if available
         email: Optional[str] = payload.get("email")
 
-        return TokenData(user_id=user_id, email=email)
+        token_data = TokenData(user_id=user_id, email=email)
+        _token_cache[token] = (token_data, payload.get("exp"))
+        return token_data
 
     except JWTError as e:
         raise HTTPException(
@@ -4,19 +4,60 @@ Uses TTL-based in-memory cache keyed by file content hash + config.
 """
 
 import hashlib
-import json
-from typing import Any, Optional
+import zlib
+from typing import Any, List, Optional, Tuple
 
-from cachetools import TTLCache
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
 
-# In-memory cache: max 100 entries, 1 hour TTL
+# Result cache is two-tier: a small hot LRU holding live dicts in front
+# of the TTL store, which keeps zlib-compressed orjson payloads so a
+# hundred cached graphs don't dominate RSS.
+_hot_cache: LRUCache = LRUCache(maxsize=8)
 _cache: TTLCache = TTLCache(maxsize=100, ttl=3600)
 
 
+def _texts_size(texts: Tuple[str, ...]) -> int:
+    """Approximate memory footprint of a cached text list in bytes."""
+    return sum(len(t) for t in texts) or 1
+
+
+# Parsed-texts cache keyed by (content hash, text column, suffix),
+# capped by total cached bytes rather than entry count
+_texts_cache: LRUCache = LRUCache(maxsize=64 * 1024 * 1024, getsizeof=_texts_size)
+
+
+# Session cache for exploratory re-runs: tokenized upload state keyed by
+# session id, so tweaking min_frequency/cluster_method skips re-tokenizing
+_session_cache: TTLCache = TTLCache(maxsize=32, ttl=600)
+
+# Processed Stripe webhook events, so burst retries skip their Supabase
+# writes; a second cache keeps the newest event timestamp per
+# subscription so late-arriving older updates are ignored
+_webhook_events: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+_subscription_created: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+# Prepared chat contexts keyed by a digest of the analysis payload, so
+# every turn of a conversation doesn't rebuild the same context string
+_context_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+
+# Semantic chat cache: per-context lists of (message embedding, response),
+# matched by cosine similarity so near-identical follow-ups skip the LLM
+_chat_cache: LRUCache = LRUCache(maxsize=256)
+_CHAT_SIMILARITY_THRESHOLD = 0.87
+_CHAT_ENTRIES_PER_CONTEXT = 64
+
+
 def _make_key(file_hashes: list[str], config: dict) -> str:
     """Create a deterministic cache key from file hashes and config."""
-    key_data = json.dumps({"files": sorted(file_hashes), "config": config}, sort_keys=True)
-    return hashlib.sha256(key_data.encode()).hexdigest()
+    key_data = orjson.dumps(
+        {"files": sorted(file_hashes), "config": config},
+        option=orjson.OPT_SORT_KEYS
+    )
+    # Cache keys need speed, not cryptographic strength; blake2b is the
+    # fastest digest in hashlib and 16 bytes is ample for these tables
+    return hashlib.blake2b(key_data, digest_size=16).hexdigest()
 
 
 def hash_content(content: bytes) -> str:
@@ -27,10 +68,125 @@ def hash_content(content: bytes) -> str:
 def get_cached(file_hashes: list[str], config: dict) -> Optional[Any]:
     """Look up a cached result. Returns None on miss."""
     key = _make_key(file_hashes, config)
-    return _cache.get(key)
+    result = _hot_cache.get(key)
+    if result is not None:
+        return result
+    blob = _cache.get(key)
+    if blob is None:
+        return None
+    # Promote to the hot tier so repeat hits skip decompression
+    result = orjson.loads(zlib.decompress(blob))
+    _hot_cache[key] = result
+    return result
 
 
 def set_cached(file_hashes: list[str], config: dict, result: Any) -> None:
     """Store a result in the cache."""
     key = _make_key(file_hashes, config)
-    _cache[key] = result
+    _hot_cache[key] = result
+    _cache[key] = zlib.compress(
+        orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY), level=3
+    )
+
+
+def make_session_key(digest: str, config: dict) -> str:
+    """Build the state key for a session cache entry."""
+    return _make_key([digest], config)
+
+
+def get_session_tokens(session_id: str, state_key: str) -> Optional[Any]:
+    """Look up a session's tokenized state. Returns None on miss or stale key."""
+    entry = _session_cache.get(session_id)
+    if entry is not None and entry[0] == state_key:
+        return entry[1]
+    return None
+
+
+def set_session_tokens(session_id: str, state_key: str, state: Any) -> None:
+    """Store a session's tokenized state, replacing any previous file."""
+    _session_cache[session_id] = (state_key, state)
+
+
+def seen_webhook_event(event_id: str) -> bool:
+    """Return True if this webhook event was already processed; marks it."""
+    if event_id in _webhook_events:
+        return True
+    _webhook_events[event_id] = True
+    return False
+
+
+def stale_subscription_event(subscription_id: str, created: int) -> bool:
+    """
+    Return True if a newer event for this subscription was already seen.
+
+    Stripe retries can deliver subscription updates out of order; only
+    the newest event per subscription should win.
+    """
+    latest = _subscription_created.get(subscription_id)
+    if latest is not None and created < latest:
+        return True
+    _subscription_created[subscription_id] = created
+    return False
+
+
+def make_context_key(analysis_data: Any, stats: Any, group_names: Any, group_keys: Any) -> str:
+    """Digest an analysis payload for context-cache lookups."""
+    key_data = orjson.dumps(
+        {"data": analysis_data, "stats": stats, "names": group_names, "keys": group_keys},
+        option=orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    )
+    return hashlib.blake2b(key_data, digest_size=16).hexdigest()
+
+
+def get_cached_context(context_key: str) -> Optional[str]:
+    """Look up a prepared chat context. Returns None on miss."""
+    return _context_cache.get(context_key)
+
+
+def set_cached_context(context_key: str, context: str) -> None:
+    """Store a prepared chat context."""
+    _context_cache[context_key] = context
+
+
+def get_cached_chat(context_key: str, message_embedding: np.ndarray) -> Optional[str]:
+    """
+    Look up a chat response for a semantically similar earlier message.
+
+    Embeddings are normalized, so cosine similarity reduces to a dot
+    product. Returns None when no cached message is similar enough.
+    """
+    entries = _chat_cache.get(context_key)
+    if not entries:
+        return None
+    similarities = np.stack([vec for vec, _ in entries]) @ message_embedding
+    best = int(np.argmax(similarities))
+    if similarities[best] >= _CHAT_SIMILARITY_THRESHOLD:
+        return entries[best][1]
+    return None
+
+
+def set_cached_chat(context_key: str, message_embedding: np.ndarray, response: str) -> None:
+    """Store a chat response under its context, evicting oldest entries."""
+    entries = _chat_cache.get(context_key)
+    if entries is None:
+        entries = []
+        _chat_cache[context_key] = entries
+    entries.append((message_embedding, response))
+    if len(entries) > _CHAT_ENTRIES_PER_CONTEXT:
+        del entries[0]
+
+
+def get_cached_texts(digest: str, text_column: int, suffix: str) -> Optional[List[str]]:
+    """Look up parsed texts by file content hash. Returns None on miss."""
+    texts = _texts_cache.get((digest, text_column, suffix))
+    return list(texts) if texts is not None else None
+
+
+def set_cached_texts(digest: str, text_column: int, suffix: str, texts: List[str]) -> None:
+    """Store parsed texts keyed by file content hash."""
+    try:
+        _texts_cache[(digest, text_column, suffix)] = tuple(texts)
+    except ValueError:
+        # Single value larger than the cache cap; skip caching
+        pass
@@ -3,18 +3,40 @@ Chat service for discussing analysis results with GPT.
 Optimized for cost efficiency.
 """
 
+import heapq
+
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 from .config import settings
 
+# Tokenizer for history budgeting; resolved once at import. Unknown
+# model names fall back to the cl100k_base encoding used by the
+# gpt-3.5/gpt-4 family, and a missing tiktoken falls back to the old
+# fixed message cap.
+try:
+    import tiktoken
+    try:
+        _ENCODING = tiktoken.encoding_for_model(settings.OPENAI_MODEL)
+    except KeyError:
+        _ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _ENCODING = None
+
 
 class ChatService:
     """Handles chat interactions with GPT about analysis data."""
 
+    # Context window for the gpt-3.5-turbo class models, minus a safety
+    # buffer, bounds how much history gets replayed per request
+    _CONTEXT_WINDOW = 16_385
+    _HISTORY_SAFETY_BUFFER = 1_024
+
     def __init__(self):
         self.client = None
         if settings.OPENAI_API_KEY:
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            # Async client: generation awaits on the event loop instead
+            # of holding a worker thread for the whole completion
+            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
     def is_available(self) -> bool:
         """Check if chat service is configured."""
@@ -65,38 +87,49 @@ class ChatService:
         # Add top words (sorted by avg_normalized)
         context_parts.append(f"\n=== TOP {max_words} WORDS ===")
 
-        # Sort by average normalized and take top N
-        sorted_data = sorted(
+        # Top N by average normalized; nlargest keeps a bounded heap
+        # instead of sorting the full list
+        sorted_data = heapq.nlargest(
+            max_words,
             analysis_data,
-            key=lambda x: x.get('avg_normalized', 0),
-            reverse=True
-        )[:max_words]
+            key=lambda x: x.get('avg_normalized', 0)
+        )
 
-        for item in sorted_data:
-            word = item.get('word', '')
-            avg = item.get('avg_normalized', 0)
+        # Compile one row template up front so the loop does a single
+        # .format call per word instead of per-group f-strings and joins
+        def _escape(name: str) -> str:
+            return name.replace('{', '{{').replace('}', '}}')
+
+        group_fields = [
+            (f'{key}_count', f'{key}_normalized')
+            for key in group_keys
+        ]
+        row_template = "- {}: avg={}%, " + ", ".join(
+            f"{_escape(name)}:{{}}({{}}%)" for name in group_names
+        ) + "{}"
+
+        a_leaning = f" [{group_names[0]}-leaning]" if num_groups == 2 else ""
+        b_leaning = f" [{group_names[1]}-leaning]" if num_groups == 2 else ""
 
-            # Build per-group info
-            group_info = []
-            for name, key in zip(group_names, group_keys):
-                count = item.get(f'{key}_count', 0)
-                norm = item.get(f'{key}_normalized', 0)
-                group_info.append(f"{name}:{count}({norm}%)")
+        for item in sorted_data:
+            values = [item.get('word', ''), item.get('avg_normalized', 0)]
+            for count_key, norm_key in group_fields:
+                values.append(item.get(count_key, 0))
+                values.append(item.get(norm_key, 0))
 
             # Add difference for 2 groups
             diff_str = ""
             if num_groups == 2:
                 diff = item.get('difference', 0)
                 if diff > 10:
-                    diff_str = f" [{group_names[0]}-leaning]"
+                    diff_str = a_leaning
                 elif diff < -10:
-                    diff_str = f" [{group_names[1]}-leaning]"
+                    diff_str = b_leaning
                 else:
                     diff_str = " [balanced]"
+            values.append(diff_str)
 
-            context_parts.append(
-                f"- {word}: avg={avg}%, {', '.join(group_info)}{diff_str}"
-            )
+            context_parts.append(row_template.format(*values))
 
         # Add key patterns
         context_parts.append("\n=== KEY PATTERNS ===")
@@ -123,18 +156,48 @@ class ChatService:
 
         # Find most connected words (highest betweenness)
         for name, key in zip(group_names, group_keys):
-            high_betweenness = sorted(
-                [d for d in sorted_data if d.get(f'{key}_betweenness', 0) > 0.05],
-                key=lambda x: x.get(f'{key}_betweenness', 0),
-                reverse=True
-            )[:3]
+            betweenness_key = f'{key}_betweenness'
+            high_betweenness = heapq.nlargest(
+                3,
+                (d for d in sorted_data if d.get(betweenness_key, 0) > 0.05),
+                key=lambda x: x.get(betweenness_key, 0)
+            )
             if high_betweenness:
                 words = [d['word'] for d in high_betweenness]
                 context_parts.append(f"{name} bridge words: {', '.join(words)}")
 
         return "\n".join(context_parts)
 
-    def chat(
+    @staticmethod
+    def _trim_history(history: List[Dict], budget: int) -> List[Dict]:
+        """
+        Keep the newest whole user/assistant turns that fit the token budget.
+
+        A fixed message cap lets one long answer blow the context window
+        while truncating many short turns prematurely; counting tokens
+        keeps cost predictable. Falls back to the old 12-message cap when
+        tiktoken is unavailable.
+        """
+        if _ENCODING is None:
+            return history[-12:]
+
+        kept: List[Dict] = []
+        used = 0
+        end = len(history)
+        while end >= 2:
+            pair = history[end - 2:end]
+            # Small per-message overhead for role/format tokens
+            pair_tokens = sum(
+                len(_ENCODING.encode(m.get("content") or "")) + 4 for m in pair
+            )
+            if used + pair_tokens > budget:
+                break
+            kept[:0] = pair
+            used += pair_tokens
+            end -= 2
+        return kept
+
+    async def chat(
         self,
         message: str,
         context: str,
@@ -178,17 +241,19 @@ Answer questions about this data. Be specific and reference actual words/numbers
             }
         ]
 
-        # Add conversation history (limit to last 6 exchanges for cost)
+        # Add as much recent history as the token budget allows
         if conversation_history:
-            # Keep only recent history to limit tokens
-            recent_history = conversation_history[-12:]  # 6 exchanges
-            messages.extend(recent_history)
+            budget = self._CONTEXT_WINDOW - settings.OPENAI_MAX_TOKENS - self._HISTORY_SAFETY_BUFFER
+            if _ENCODING is not None:
+                budget -= len(_ENCODING.encode(messages[0]["content"]))
+                budget -= len(_ENCODING.encode(message))
+            messages.extend(self._trim_history(conversation_history, budget))
 
         # Add current message
         messages.append({"role": "user", "content": message})
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
                 messages=messages,
                 max_tokens=settings.OPENAI_MAX_TOKENS,
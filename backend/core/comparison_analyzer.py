@@ -3,7 +3,9 @@ Comparison analysis module for comparing networks between groups.
 """
 
 from typing import List, Dict, Tuple, Optional, Set
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+import numpy as np
 
 from .text_processor import TextProcessor
 from .network_builder import NetworkBuilder
@@ -110,61 +112,101 @@ class ComparisonAnalyzer:
         max_a = max(self.builder_a.word_counts.values()) if self.builder_a.word_counts else 1
         max_b = max(self.builder_b.word_counts.values()) if self.builder_b.word_counts else 1
         
-        # Build comparison data
+        # Precompute the per-group key strings once; the loop below
+        # otherwise re-renders a dozen f-strings for every word
+        ka, kb = self.group_a_key, self.group_b_key
+        k_count_a, k_count_b = f'{ka}_count', f'{kb}_count'
+        k_norm_a, k_norm_b = f'{ka}_normalized', f'{kb}_normalized'
+        k_cluster_a, k_cluster_b = f'{ka}_cluster', f'{kb}_cluster'
+        k_degree_a, k_degree_b = f'{ka}_degree', f'{kb}_degree'
+        k_strength_a, k_strength_b = f'{ka}_strength', f'{kb}_strength'
+        k_between_a, k_between_b = f'{ka}_betweenness', f'{kb}_betweenness'
+        k_close_a, k_close_b = f'{ka}_closeness', f'{kb}_closeness'
+        k_eigen_a, k_eigen_b = f'{ka}_eigenvector', f'{kb}_eigenvector'
+
+        # Vectorize the numeric block: counts, normalization, threshold
+        # mask and derived columns are array ops instead of per-word
+        # Python arithmetic
+        word_list = list(all_words)
+        n = len(word_list)
+        counts_a = self.builder_a.word_counts
+        counts_b = self.builder_b.word_counts
+        arr_a = np.fromiter((counts_a.get(w, 0) for w in word_list), dtype=np.int32, count=n)
+        arr_b = np.fromiter((counts_b.get(w, 0) for w in word_list), dtype=np.int32, count=n)
+
+        norms_a = np.round(arr_a * (100.0 / max_a), 2)
+        norms_b = np.round(arr_b * (100.0 / max_b), 2)
+        keep = (norms_a >= min_score_threshold) | (norms_b >= min_score_threshold)
+        kept = np.flatnonzero(keep)
+
+        # Emit rows already in display order (avg_normalized descending);
+        # argsort in C replaces the later Timsort over dicts
+        kept_avg = np.round((norms_a[kept] + norms_b[kept]) * 0.5, 2)
+        kept = kept[np.argsort(-kept_avg, kind='stable')]
+
+        # Materialize plain Python values once; the dict build below only
+        # touches rows that passed the threshold
+        kept_words = [word_list[i] for i in kept.tolist()]
+        kept_counts_a = arr_a[kept].tolist()
+        kept_counts_b = arr_b[kept].tolist()
+        kept_norms_a = norms_a[kept].tolist()
+        kept_norms_b = norms_b[kept].tolist()
+        differences = np.round(norms_a[kept] - norms_b[kept], 2).tolist()
+        averages = np.round((norms_a[kept] + norms_b[kept]) * 0.5, 2).tolist()
+
+        # Build comparison data, accumulating the stats counters in the
+        # same pass instead of re-scanning the list afterwards
         self.comparison_data = []
-        
-        for word in all_words:
-            count_a = self.builder_a.word_counts.get(word, 0)
-            count_b = self.builder_b.word_counts.get(word, 0)
-            
-            norm_a = round((count_a / max_a) * 100, 2) if count_a > 0 else 0
-            norm_b = round((count_b / max_b) * 100, 2) if count_b > 0 else 0
-            
-            # Check threshold
-            if norm_a < min_score_threshold and norm_b < min_score_threshold:
-                continue
-            
+        words_in_both = 0
+        a_only = 0
+        b_only = 0
+
+        for word, count_a, count_b, norm_a, norm_b, difference, avg in zip(
+            kept_words, kept_counts_a, kept_counts_b,
+            kept_norms_a, kept_norms_b, differences, averages
+        ):
             # Get metrics
             m_a = metrics_a.get(word, {})
             m_b = metrics_b.get(word, {})
-            
+
+            in_both = count_a > 0 and count_b > 0
+            if in_both:
+                words_in_both += 1
+            elif count_a > 0:
+                a_only += 1
+            elif count_b > 0:
+                b_only += 1
+
             self.comparison_data.append({
                 'word': word,
-                f'{self.group_a_key}_count': count_a,
-                f'{self.group_b_key}_count': count_b,
-                f'{self.group_a_key}_normalized': norm_a,
-                f'{self.group_b_key}_normalized': norm_b,
-                'difference': round(norm_a - norm_b, 2),
-                'avg_normalized': round((norm_a + norm_b) / 2, 2),
-                'in_both': count_a > 0 and count_b > 0,
-                f'{self.group_a_key}_cluster': clusters_a.get(word, -1),
-                f'{self.group_b_key}_cluster': clusters_b.get(word, -1),
-                f'{self.group_a_key}_degree': m_a.get('degree', 0),
-                f'{self.group_a_key}_strength': m_a.get('strength', 0),
-                f'{self.group_a_key}_betweenness': round(m_a.get('betweenness', 0), 3),
-                f'{self.group_a_key}_closeness': round(m_a.get('closeness', 0), 3),
-                f'{self.group_a_key}_eigenvector': round(m_a.get('eigenvector', 0), 3),
-                f'{self.group_b_key}_degree': m_b.get('degree', 0),
-                f'{self.group_b_key}_strength': m_b.get('strength', 0),
-                f'{self.group_b_key}_betweenness': round(m_b.get('betweenness', 0), 3),
-                f'{self.group_b_key}_closeness': round(m_b.get('closeness', 0), 3),
-                f'{self.group_b_key}_eigenvector': round(m_b.get('eigenvector', 0), 3),
+                k_count_a: count_a,
+                k_count_b: count_b,
+                k_norm_a: norm_a,
+                k_norm_b: norm_b,
+                'difference': difference,
+                'avg_normalized': avg,
+                'in_both': in_both,
+                k_cluster_a: clusters_a.get(word, -1),
+                k_cluster_b: clusters_b.get(word, -1),
+                k_degree_a: m_a.get('degree', 0),
+                k_strength_a: m_a.get('strength', 0),
+                k_between_a: round(m_a.get('betweenness', 0), 3),
+                k_close_a: round(m_a.get('closeness', 0), 3),
+                k_eigen_a: round(m_a.get('eigenvector', 0), 3),
+                k_degree_b: m_b.get('degree', 0),
+                k_strength_b: m_b.get('strength', 0),
+                k_between_b: round(m_b.get('betweenness', 0), 3),
+                k_close_b: round(m_b.get('closeness', 0), 3),
+                k_eigen_b: round(m_b.get('eigenvector', 0), 3),
             })
-        
-        # Sort by average normalized
-        self.comparison_data.sort(key=lambda x: x['avg_normalized'], reverse=True)
-        
-        # Combine edges from both networks
-        combined_edges = defaultdict(int)
-        
-        for (w1, w2), weight in self.builder_a.edges.items():
-            combined_edges[(w1, w2)] += weight
-        
-        for (w1, w2), weight in self.builder_b.edges.items():
-            combined_edges[(w1, w2)] += weight
-        
+
+        # Combine edges from both networks; Counter.update merges the
+        # weight dicts in C instead of a per-edge Python loop
+        combined_edges = Counter(self.builder_a.edges)
+        combined_edges.update(self.builder_b.edges)
+
         # Filter edges to only include words in comparison
-        valid_words = set(item['word'] for item in self.comparison_data)
+        valid_words = frozenset(kept_words)
         
         self.combined_edges = [
             {'from': w1, 'to': w2, 'weight': weight}
@@ -177,17 +219,31 @@ class ComparisonAnalyzer:
             'edges': self.combined_edges,
             'stats': {
                 'total_words': len(self.comparison_data),
-                'words_in_both': len([d for d in self.comparison_data if d['in_both']]),
-                f'{self.group_a_key}_only': len([d for d in self.comparison_data if d[f'{self.group_a_key}_count'] > 0 and d[f'{self.group_b_key}_count'] == 0]),
-                f'{self.group_b_key}_only': len([d for d in self.comparison_data if d[f'{self.group_b_key}_count'] > 0 and d[f'{self.group_a_key}_count'] == 0]),
+                'words_in_both': words_in_both,
+                f'{ka}_only': a_only,
+                f'{kb}_only': b_only,
                 'total_edges': len(self.combined_edges),
-                f'{self.group_a_key}_clusters': len(set(clusters_a.values())),
-                f'{self.group_b_key}_clusters': len(set(clusters_b.values())),
+                f'{ka}_clusters': len(set(clusters_a.values())),
+                f'{kb}_clusters': len(set(clusters_b.values())),
             },
             'group_a_name': self.group_a_name,
             'group_b_name': self.group_b_name
         }
     
+    @staticmethod
+    def _accumulate_edges(processed_texts: List[List[str]]) -> Dict[Tuple[str, str], int]:
+        """Count unordered word-pair co-occurrences across documents."""
+        from itertools import combinations
+
+        edges = defaultdict(int)
+        for words in processed_texts:
+            # Pair keys are ordered at insertion; sorting each document's
+            # word list first is redundant
+            for w1, w2 in combinations(set(words), 2):
+                pair = (w1, w2) if w1 < w2 else (w2, w1)
+                edges[pair] += 1
+        return edges
+
     def get_word_pairs(
         self,
         texts_a: List[str],
@@ -195,60 +251,55 @@ class ComparisonAnalyzer:
     ) -> List[Dict]:
         """
         Get word pair co-occurrences for both groups.
-        
+
         Args:
             texts_a: Texts from group A
             texts_b: Texts from group B
-            
+
         Returns:
             List of word pair data with connections per group
         """
-        from itertools import combinations
-        
         # Process texts and build edges for each group
         result_a = self.processor.process_texts(texts_a)
         result_b = self.processor.process_texts(texts_b)
-        
-        edges_a = defaultdict(int)
-        edges_b = defaultdict(int)
-        
-        for words in result_a['processed_texts']:
-            for pair in combinations(sorted(set(words)), 2):
-                edges_a[pair] += 1
-        
-        for words in result_b['processed_texts']:
-            for pair in combinations(sorted(set(words)), 2):
-                edges_b[pair] += 1
-        
+
+        edges_a = self._accumulate_edges(result_a['processed_texts'])
+        edges_b = self._accumulate_edges(result_b['processed_texts'])
+
         # Combine
         all_pairs = set(edges_a.keys()) | set(edges_b.keys())
-        
+
+        k_conn_a = f'{self.group_a_key}_connections'
+        k_conn_b = f'{self.group_b_key}_connections'
+        k_norm_a = f'{self.group_a_key}_normalized'
+        k_norm_b = f'{self.group_b_key}_normalized'
+
         pairs_data = []
         for pair in all_pairs:
             conn_a = edges_a.get(pair, 0)
             conn_b = edges_b.get(pair, 0)
             total = conn_a + conn_b
-            
+
             pairs_data.append({
                 'word_1': pair[0],
                 'word_2': pair[1],
-                f'{self.group_a_key}_connections': conn_a,
-                f'{self.group_b_key}_connections': conn_b,
+                k_conn_a: conn_a,
+                k_conn_b: conn_b,
                 'total_connections': total
             })
-        
+
         # Sort by total
         pairs_data.sort(key=lambda x: x['total_connections'], reverse=True)
-        
+
         # Normalize
-        max_a = max((p[f'{self.group_a_key}_connections'] for p in pairs_data), default=1)
-        max_b = max((p[f'{self.group_b_key}_connections'] for p in pairs_data), default=1)
+        max_a = max((p[k_conn_a] for p in pairs_data), default=1)
+        max_b = max((p[k_conn_b] for p in pairs_data), default=1)
         max_total = max((p['total_connections'] for p in pairs_data), default=1)
-        
+
         for p in pairs_data:
-            p[f'{self.group_a_key}_normalized'] = round((p[f'{self.group_a_key}_connections'] / max_a) * 100, 2)
-            p[f'{self.group_b_key}_normalized'] = round((p[f'{self.group_b_key}_connections'] / max_b) * 100, 2)
+            p[k_norm_a] = round((p[k_conn_a] / max_a) * 100, 2)
+            p[k_norm_b] = round((p[k_conn_b] / max_b) * 100, 2)
             p['total_normalized'] = round((p['total_connections'] / max_total) * 100, 2)
-            p['difference'] = round(p[f'{self.group_a_key}_normalized'] - p[f'{self.group_b_key}_normalized'], 2)
-        
+            p['difference'] = round(p[k_norm_a] - p[k_norm_b], 2)
+
         return pairs_data
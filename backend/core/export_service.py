@@ -2,19 +2,20 @@
 Export service for analysis data in multiple formats.
 """
 import io
-import json
 import networkx as nx
 import openpyxl
+import orjson
 from typing import List, Dict, Any
 
 
 def export_excel(nodes: List[Dict], edges: List[Dict], stats: Dict, group_names: List[str], group_keys: List[str]) -> bytes:
     """Export to Excel with multiple sheets: Words, Edges, Stats."""
-    wb = openpyxl.Workbook()
-    
+    # Write-only mode streams rows straight to the serializer instead of
+    # keeping a cell object per value in memory
+    wb = openpyxl.Workbook(write_only=True)
+
     # Words sheet
-    ws_words = wb.active
-    ws_words.title = "Words"
+    ws_words = wb.create_sheet("Words")
     # Headers
     headers = ["Word"]
     for i, name in enumerate(group_names):
@@ -74,7 +75,11 @@ def export_json(nodes: List[Dict], edges: List[Dict], stats: Dict, group_names:
         "group_names": group_names,
         "group_keys": group_keys,
     }
-    return json.dumps(data, indent=2, default=str).encode("utf-8")
+    return orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    )
 
 
 def _build_nx_graph(nodes: List[Dict], edges: List[Dict], group_keys: List[str]) -> nx.Graph:
@@ -60,6 +60,33 @@ class MultiGroupAnalyzer:
         self.analysis_data = []
         self.combined_edges = []
 
+    def add_semantic_edges_bulk(self, semantic_analyzer, threshold: float = 0.5) -> int:
+        """
+        Add semantic edges to every group's network with one model pass.
+
+        Unions all builders' vocabularies, encodes them in one batch and
+        computes a single shared similarity matrix, then scatters the
+        per-group edges back to each builder — words shared across
+        groups are embedded and compared once.
+
+        Args:
+            semantic_analyzer: SemanticAnalyzer instance
+            threshold: Minimum similarity to create an edge (0-1)
+
+        Returns:
+            Total number of semantic edges added across groups
+        """
+        word_lists = [
+            list(builder.graph.nodes()) if builder.graph else []
+            for builder in self.builders
+        ]
+        edge_lists = semantic_analyzer.get_semantic_edges_multi(word_lists, threshold)
+
+        added = 0
+        for builder, edges in zip(self.builders, edge_lists):
+            added += builder.apply_semantic_edges(edges)
+        return added
+
     def add_word_mappings(self, mappings: Dict[str, str]):
         """Add word mappings to the processor."""
         self.processor.add_mappings(mappings)
@@ -3,8 +3,7 @@ Network building module for creating semantic co-occurrence networks.
 """
 
 from typing import List, Dict, Tuple, Set, Optional
-from collections import defaultdict
-from itertools import combinations
+from collections import Counter
 import networkx as nx
 import numpy as np
 from scipy import sparse
@@ -28,7 +27,48 @@ class NetworkBuilder:
         self.graph = None
         self.word_counts = {}
         self.edges = {}
-    
+        # Incremental accumulation state for chunked ingestion
+        self._chunk_texts: List[List[str]] = []
+        self._chunk_counts = Counter()
+
+    def update_counts(self, texts: List[str]) -> None:
+        """
+        Process a chunk of texts and accumulate tokens/word counts.
+
+        Allows large files to be fed incrementally (chunk by chunk) so the
+        raw text list never has to be fully materialized. Call
+        finalize_network once all chunks are in.
+
+        Args:
+            texts: Chunk of text strings
+        """
+        result = self.processor.process_texts(texts)
+        self._chunk_texts.extend(result['processed_texts'])
+        self._chunk_counts.update(result['word_counts'])
+
+    def finalize_network(
+        self,
+        min_frequency: int = 1,
+        min_edge_weight: int = 1
+    ) -> nx.Graph:
+        """
+        Build the network from accumulated chunks.
+
+        Args:
+            min_frequency: Minimum word frequency to include
+            min_edge_weight: Minimum edge weight to include
+
+        Returns:
+            NetworkX graph of word co-occurrences
+        """
+        processed_texts = self._chunk_texts
+        word_counts = self._chunk_counts
+        self._chunk_texts = []
+        self._chunk_counts = Counter()
+        return self._build_from_processed(
+            processed_texts, word_counts, min_frequency, min_edge_weight
+        )
+
     def build_network(
         self,
         texts: List[str],
@@ -37,46 +77,123 @@ class NetworkBuilder:
     ) -> nx.Graph:
         """
         Build a co-occurrence network from texts.
-        
+
         Args:
             texts: List of text strings
             min_frequency: Minimum word frequency to include
             min_edge_weight: Minimum edge weight to include
-            
+
         Returns:
             NetworkX graph of word co-occurrences
         """
-        # Process texts
-        result = self.processor.process_texts(texts)
-        processed_texts = result['processed_texts']
-        word_counts = result['word_counts']
-        
+        # Survey data repeats identical rows ("none", "n/a", ...) heavily:
+        # tokenize each distinct text once and weight its contribution by
+        # the duplicate count instead of reprocessing every copy.
+        text_weights = Counter(texts)
+        result = self.processor.process_texts(list(text_weights))
+        row_weights = list(text_weights.values())
+
+        word_counts = Counter()
+        for tokens, weight in zip(result['processed_texts'], row_weights):
+            if weight == 1:
+                word_counts.update(tokens)
+            else:
+                for token in tokens:
+                    word_counts[token] += weight
+
+        return self._build_from_processed(
+            result['processed_texts'], word_counts,
+            min_frequency, min_edge_weight, row_weights
+        )
+
+    def build_network_processed(
+        self,
+        processed_texts: List[List[str]],
+        word_counts: Dict[str, int],
+        min_frequency: int = 1,
+        min_edge_weight: int = 1
+    ) -> nx.Graph:
+        """
+        Build a network from already-tokenized texts.
+
+        Lets callers that cache the output of process_texts (e.g. the
+        session cache) skip tokenization entirely on re-runs.
+
+        Args:
+            processed_texts: Tokenized texts as produced by process_texts
+            word_counts: Word frequency mapping for those texts
+            min_frequency: Minimum word frequency to include
+            min_edge_weight: Minimum edge weight to include
+
+        Returns:
+            NetworkX graph of word co-occurrences
+        """
+        return self._build_from_processed(
+            processed_texts, word_counts, min_frequency, min_edge_weight
+        )
+
+    def _build_from_processed(
+        self,
+        processed_texts: List[List[str]],
+        word_counts: Dict[str, int],
+        min_frequency: int,
+        min_edge_weight: int,
+        row_weights: Optional[List[int]] = None
+    ) -> nx.Graph:
+        """
+        Build the graph from already-processed token lists.
+
+        row_weights gives the number of source rows each token list stands
+        for (1 if texts were not deduplicated).
+        """
         # Filter by frequency
         self.word_counts = {
-            word: count 
-            for word, count in word_counts.items() 
+            word: count
+            for word, count in word_counts.items()
             if count >= min_frequency
         }
-        
+
         valid_words = set(self.word_counts.keys())
-        
-        # Build edges
-        edge_weights = defaultdict(int)
-        
-        for words in processed_texts:
-            # Get unique valid words in this text
-            text_words = set(w for w in words if w in valid_words)
-            
-            # Create pairs
-            for pair in combinations(sorted(text_words), 2):
-                edge_weights[pair] += 1
-        
-        # Filter edges by weight
-        self.edges = {
-            pair: weight 
-            for pair, weight in edge_weights.items() 
-            if weight >= min_edge_weight
-        }
+
+        # Count co-occurrences via a sparse incidence product instead of a
+        # Python pair loop: X[i, j] = 1 if word j appears in text i, so
+        # X.T @ X gives pairwise co-occurrence counts in compiled code.
+        # Vocabulary is sorted so the upper triangle maps to the same
+        # (word1 < word2) pair ordering the old combinations() loop produced.
+        vocab = sorted(valid_words)
+        word_ids = {word: i for i, word in enumerate(vocab)}
+
+        rows = []
+        cols = []
+        for row, words in enumerate(processed_texts):
+            for word in set(words):
+                word_id = word_ids.get(word)
+                if word_id is not None:
+                    rows.append(row)
+                    cols.append(word_id)
+
+        self.edges = {}
+        if rows:
+            incidence = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                shape=(len(processed_texts), len(vocab))
+            )
+            if row_weights:
+                # Each deduplicated row stands for row_weights[i] source
+                # rows: scale one factor so pair counts come out weighted
+                # (B.T @ diag(w) @ B), not squared.
+                weighted = incidence.multiply(
+                    np.asarray(row_weights, dtype=np.int32)[:, None]
+                ).tocsr()
+            else:
+                weighted = incidence
+            cooc = sparse.triu(incidence.T @ weighted, k=1).tocoo()
+
+            self.edges = {
+                (vocab[i], vocab[j]): int(weight)
+                for i, j, weight in zip(cooc.row, cooc.col, cooc.data)
+                if weight >= min_edge_weight
+            }
         
         # Build graph
         self.graph = nx.Graph()
@@ -233,7 +350,7 @@ class NetworkBuilder:
         Detect clusters/communities in the network.
 
         Args:
-            method: Clustering method ('louvain', 'spectral')
+            method: Clustering method ('louvain', 'leiden', 'spectral')
             n_clusters: Number of clusters for spectral clustering
             resolution: Resolution parameter for Louvain (higher = more clusters)
 
@@ -248,7 +365,69 @@ class NetworkBuilder:
             # All nodes in separate clusters if no edges
             return {node: i for i, node in enumerate(self.graph.nodes())}
 
+        if method == 'leiden':
+            try:
+                import igraph as ig
+                import leidenalg
+
+                g = ig.Graph.from_networkx(self.graph)
+                leiden_partition = leidenalg.find_partition(
+                    g,
+                    leidenalg.ModularityVertexPartition,
+                    weights='weight' if 'weight' in g.es.attributes() else None,
+                    seed=42
+                )
+
+                names = g.vs['_nx_name']
+                partition = {}
+                for cluster_id, members in enumerate(leiden_partition):
+                    for v in members:
+                        partition[names[v]] = cluster_id
+                self.last_partition = partition
+
+                num_clusters = len(leiden_partition)
+                print(f"[LEIDEN] Graph: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges -> {num_clusters} clusters")
+
+                return partition
+            except ImportError:
+                print("[LEIDEN] leidenalg/igraph not installed, falling back to louvain")
+                method = 'louvain'
+            except Exception as e:
+                print(f"[LEIDEN ERROR] {e}")
+                method = 'louvain'
+
         if method == 'louvain':
+            try:
+                import random
+
+                import igraph as ig
+
+                # Seed igraph's RNG for reproducibility, matching the
+                # random_state=42 convention of the other backends
+                ig.set_random_number_generator(random.Random(42))
+
+                g = ig.Graph.from_networkx(self.graph)
+                clustering = g.community_multilevel(
+                    weights='weight' if 'weight' in g.es.attributes() else None,
+                    resolution=resolution
+                )
+
+                names = g.vs['_nx_name']
+                partition = {}
+                for cluster_id, members in enumerate(clustering):
+                    for v in members:
+                        partition[names[v]] = cluster_id
+                self.last_partition = partition
+
+                num_clusters = len(clustering)
+                print(f"[LOUVAIN] Graph: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges -> {num_clusters} clusters")
+
+                return partition
+            except ImportError:
+                print("[LOUVAIN] igraph not installed, falling back to python-louvain")
+            except Exception as e:
+                print(f"[LOUVAIN] igraph backend failed ({e}), falling back to python-louvain")
+
             try:
                 # Use fixed random_state for reproducibility
                 partition = community_louvain.best_partition(
@@ -414,6 +593,25 @@ class NetworkBuilder:
 
         words = list(self.graph.nodes())
         semantic_edges = semantic_analyzer.get_semantic_edges(words, threshold)
+        return self.apply_semantic_edges(semantic_edges, weight_multiplier)
+
+    def apply_semantic_edges(
+        self,
+        semantic_edges: List[Dict],
+        weight_multiplier: float = 10.0
+    ) -> int:
+        """
+        Merge precomputed semantic edges into the network.
+
+        Args:
+            semantic_edges: Edge dicts as produced by get_semantic_edges
+            weight_multiplier: Multiplier to convert similarity to edge weight
+
+        Returns:
+            Number of semantic edges added
+        """
+        if not self.graph:
+            return 0
 
         added = 0
         for edge in semantic_edges:
@@ -6,6 +6,8 @@ from typing import List, Dict, Tuple, Optional, Set
 import numpy as np
 from functools import lru_cache
 
+from cachetools import LRUCache
+
 from .config import settings
 
 
@@ -17,6 +19,9 @@ class SemanticAnalyzer:
 
     _instance = None
     _model = None
+    # Word -> embedding vector cache shared across requests, so repeat
+    # vocabulary becomes a dict lookup instead of a model forward pass
+    _embedding_cache: LRUCache = LRUCache(maxsize=100_000)
 
     def __new__(cls):
         if cls._instance is None:
@@ -74,15 +79,21 @@ class SemanticAnalyzer:
 
         batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
 
-        embeddings = self.model.encode(
-            words,
-            batch_size=batch_size,
-            show_progress_bar=False,
-            convert_to_numpy=True,
-            normalize_embeddings=True  # For faster cosine similarity
-        )
+        cache = SemanticAnalyzer._embedding_cache
+        misses = [word for word in words if word not in cache]
 
-        return embeddings
+        if misses:
+            encoded = self.model.encode(
+                misses,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True  # For faster cosine similarity
+            )
+            for word, vector in zip(misses, encoded):
+                cache[word] = vector
+
+        return np.stack([cache[word] for word in words])
 
     def calculate_similarity_matrix(self, words: List[str]) -> Tuple[np.ndarray, List[str]]:
         """
@@ -125,22 +136,77 @@ class SemanticAnalyzer:
         threshold = threshold or settings.SIMILARITY_THRESHOLD
         similarity_matrix, word_list = self.calculate_similarity_matrix(words)
 
-        edges = []
+        return self._edges_from_matrix(similarity_matrix, word_list, threshold)
+
+    @staticmethod
+    def _edges_from_matrix(
+        similarity_matrix: np.ndarray,
+        word_list: List[str],
+        threshold: float
+    ) -> List[Dict]:
+        """
+        Threshold the upper triangle of a similarity matrix into edge dicts.
+
+        One vectorized mask over the triangle instead of an interpreted
+        V^2 double loop; only the surviving pairs touch Python.
+        """
         n = len(word_list)
+        if n < 2:
+            return []
+
+        # Upper triangle avoids duplicates and self-loops
+        rows, cols = np.triu_indices(n, k=1)
+        sims = similarity_matrix[rows, cols]
+        keep = sims >= threshold
+
+        return [
+            {
+                'from': word_list[i],
+                'to': word_list[j],
+                'similarity': round(float(sim), 4),
+                'type': 'semantic'
+            }
+            for i, j, sim in zip(rows[keep].tolist(), cols[keep].tolist(), sims[keep].tolist())
+        ]
+
+    def get_semantic_edges_multi(
+        self,
+        word_lists: List[List[str]],
+        threshold: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Get semantic edges for several word lists from one similarity matrix.
 
-        # Only iterate upper triangle (avoid duplicates and self-loops)
-        for i in range(n):
-            for j in range(i + 1, n):
-                sim = similarity_matrix[i, j]
-                if sim >= threshold:
-                    edges.append({
-                        'from': word_list[i],
-                        'to': word_list[j],
-                        'similarity': round(float(sim), 4),
-                        'type': 'semantic'
-                    })
-
-        return edges
+        Unions the vocabularies, runs a single encode and a single
+        matmul, then slices per-list edges out of the shared matrix —
+        one GEMM instead of one per group for overlapping vocabularies.
+
+        Args:
+            word_lists: One word list per group
+            threshold: Minimum similarity to create an edge (0-1)
+
+        Returns:
+            One edge list per input list, same format as get_semantic_edges
+        """
+        threshold = threshold or settings.SIMILARITY_THRESHOLD
+        vocab = sorted(set().union(*word_lists)) if word_lists else []
+        if len(vocab) < 2:
+            return [[] for _ in word_lists]
+
+        embeddings = self.get_embeddings(vocab)
+        similarity_matrix = np.dot(embeddings, embeddings.T)
+        index = {word: i for i, word in enumerate(vocab)}
+
+        results = []
+        for words in word_lists:
+            if len(words) < 2:
+                results.append([])
+                continue
+            idx = np.fromiter((index[word] for word in words), dtype=np.intp, count=len(words))
+            submatrix = similarity_matrix[np.ix_(idx, idx)]
+            results.append(self._edges_from_matrix(submatrix, words, threshold))
+
+        return results
 
     def find_semantic_clusters(
         self,
@@ -5,6 +5,7 @@ Supabase client for user profiles and usage tracking.
 from typing import Optional, Dict, Any, List
 from datetime import date, datetime
 
+from cachetools import TTLCache
 from supabase import create_client, Client
 
 from .config import settings
@@ -13,6 +14,17 @@ from .tier_limits import get_tier_limits, check_limit, is_feature_enabled
 # Initialize Supabase client
 _supabase_client: Optional[Client] = None
 
+# Short-lived profile cache: a dashboard load fans out to several
+# endpoints that each used to issue their own SELECT for the same row.
+# Every write path invalidates, so staleness is bounded by the TTL and
+# only for rows changed outside this process.
+_profile_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
+
+
+def _invalidate_profile(user_id: str) -> None:
+    """Drop the cached profile after any write to its row."""
+    _profile_cache.pop(user_id, None)
+
 
 def get_supabase_client() -> Optional[Client]:
     """Get or create Supabase client instance."""
@@ -47,6 +59,10 @@ async def get_user_profile(user_id: str) -> Dict[str, Any]:
             "stripe_subscription_id": None,
         }
 
+    cached = _profile_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     try:
         # Try to get existing profile
         result = client.table("user_profiles").select("*").eq("id", user_id).execute()
@@ -77,6 +93,7 @@ async def get_user_profile(user_id: str) -> Dict[str, Any]:
                     }).eq("id", user_id).execute()
                     profile["chat_messages_month"] = 0
 
+            _profile_cache[user_id] = profile
             return profile
 
         # Create new profile if doesn't exist
@@ -90,6 +107,7 @@ async def get_user_profile(user_id: str) -> Dict[str, Any]:
         }
 
         client.table("user_profiles").insert(new_profile).execute()
+        _profile_cache[user_id] = new_profile
         return new_profile
 
     except Exception as e:
@@ -121,6 +139,7 @@ async def increment_analysis_count(user_id: str) -> bool:
         client.table("user_profiles").update({
             "analyses_today": profile.get("analyses_today", 0) + 1
         }).eq("id", user_id).execute()
+        _invalidate_profile(user_id)
 
         return True
     except Exception as e:
@@ -146,6 +165,7 @@ async def increment_chat_count(user_id: str) -> bool:
         client.table("user_profiles").update({
             "chat_messages_month": profile.get("chat_messages_month", 0) + 1
         }).eq("id", user_id).execute()
+        _invalidate_profile(user_id)
 
         return True
     except Exception as e:
@@ -153,12 +173,8 @@ async def increment_chat_count(user_id: str) -> bool:
         return False
 
 
-async def check_analysis_limit(user_id: str) -> Dict[str, Any]:
-    """
-    Check if user has reached their daily analysis limit.
-    Returns dict with 'allowed' bool and 'message' if blocked.
-    """
-    profile = await get_user_profile(user_id)
+def _analysis_status(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the daily analysis limit status from a profile row."""
     tier = profile.get("tier", "free")
     analyses_today = profile.get("analyses_today", 0)
     limits = get_tier_limits(tier)
@@ -187,12 +203,8 @@ async def check_analysis_limit(user_id: str) -> Dict[str, Any]:
     }
 
 
-async def check_chat_limit(user_id: str) -> Dict[str, Any]:
-    """
-    Check if user has reached their monthly chat limit.
-    Returns dict with 'allowed' bool and 'message' if blocked.
-    """
-    profile = await get_user_profile(user_id)
+def _chat_status(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the monthly chat limit status from a profile row."""
     tier = profile.get("tier", "free")
     chat_messages = profile.get("chat_messages_month", 0)
     limits = get_tier_limits(tier)
@@ -229,11 +241,8 @@ async def check_chat_limit(user_id: str) -> Dict[str, Any]:
     }
 
 
-async def check_groups_limit(user_id: str, requested_groups: int) -> Dict[str, Any]:
-    """
-    Check if user can analyze the requested number of groups.
-    """
-    profile = await get_user_profile(user_id)
+def _groups_status(profile: Dict[str, Any], requested_groups: int) -> Dict[str, Any]:
+    """Compute the groups limit status from a profile row."""
     tier = profile.get("tier", "free")
     limits = get_tier_limits(tier)
     max_groups = limits.get("max_groups", 1)
@@ -249,11 +258,8 @@ async def check_groups_limit(user_id: str, requested_groups: int) -> Dict[str, A
     return {"allowed": True, "tier": tier, "max_groups": max_groups}
 
 
-async def check_semantic_enabled(user_id: str) -> Dict[str, Any]:
-    """
-    Check if user can use semantic analysis.
-    """
-    profile = await get_user_profile(user_id)
+def _semantic_status(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute semantic feature access from a profile row."""
     tier = profile.get("tier", "free")
     enabled = is_feature_enabled(tier, "semantic_enabled")
 
@@ -267,6 +273,80 @@ async def check_semantic_enabled(user_id: str) -> Dict[str, Any]:
     return {"allowed": True, "tier": tier}
 
 
+async def check_analysis_limit(user_id: str) -> Dict[str, Any]:
+    """
+    Check if user has reached their daily analysis limit.
+    Returns dict with 'allowed' bool and 'message' if blocked.
+    """
+    return _analysis_status(await get_user_profile(user_id))
+
+
+async def check_chat_limit(user_id: str) -> Dict[str, Any]:
+    """
+    Check if user has reached their monthly chat limit.
+    Returns dict with 'allowed' bool and 'message' if blocked.
+    """
+    return _chat_status(await get_user_profile(user_id))
+
+
+async def check_groups_limit(user_id: str, requested_groups: int) -> Dict[str, Any]:
+    """
+    Check if user can analyze the requested number of groups.
+    """
+    return _groups_status(await get_user_profile(user_id), requested_groups)
+
+
+async def check_semantic_enabled(user_id: str) -> Dict[str, Any]:
+    """
+    Check if user can use semantic analysis.
+    """
+    return _semantic_status(await get_user_profile(user_id))
+
+
+async def get_profile_bundle(user_id: str) -> Dict[str, Any]:
+    """
+    Get the profile plus derived limit statuses with one profile read.
+
+    The limit checks are pure functions of the profile row, so bundling
+    them here turns the three round-trips /user/profile used to make
+    into a single one.
+
+    Returns:
+        Dict with 'profile', 'analysis_status' and 'chat_status' keys
+    """
+    profile = await get_user_profile(user_id)
+    return {
+        "profile": profile,
+        "analysis_status": _analysis_status(profile),
+        "chat_status": _chat_status(profile),
+    }
+
+
+async def check_analysis_bundle(
+    user_id: str,
+    requested_groups: int,
+    use_semantic: bool = False
+) -> Dict[str, Any]:
+    """
+    Run all pre-analysis limit checks from a single profile read.
+
+    Args:
+        user_id: User ID
+        requested_groups: Number of groups in the analysis
+        use_semantic: Whether semantic access should also be checked
+
+    Returns:
+        Dict with 'analysis', 'groups' and 'semantic' statuses
+        ('semantic' is None when use_semantic is False)
+    """
+    profile = await get_user_profile(user_id)
+    return {
+        "analysis": _analysis_status(profile),
+        "groups": _groups_status(profile, requested_groups),
+        "semantic": _semantic_status(profile) if use_semantic else None,
+    }
+
+
 async def check_export_enabled(user_id: str) -> Dict[str, Any]:
     """
     Check if user can export data.
@@ -299,6 +379,7 @@ async def update_user_tier(user_id: str, tier: str) -> bool:
         client.table("user_profiles").update({
             "tier": tier
         }).eq("id", user_id).execute()
+        _invalidate_profile(user_id)
         return True
     except Exception as e:
         print(f"Error updating user tier: {e}")
@@ -324,12 +405,52 @@ async def update_stripe_customer(
             update_data["stripe_subscription_id"] = subscription_id
 
         client.table("user_profiles").update(update_data).eq("id", user_id).execute()
+        _invalidate_profile(user_id)
         return True
     except Exception as e:
         print(f"Error updating Stripe customer: {e}")
         return False
 
 
+async def complete_checkout(
+    user_id: str,
+    customer_id: str,
+    subscription_id: Optional[str],
+    tier: str
+) -> bool:
+    """
+    Apply a completed Stripe checkout to the user's profile.
+
+    Folds the Stripe ids and the new tier into a single user_profiles
+    update (previously two separate writes), then inserts the usage log
+    row.
+    """
+    client = get_supabase_client()
+
+    if not client:
+        return False
+
+    try:
+        update_data = {
+            "stripe_customer_id": customer_id,
+            "tier": tier,
+        }
+        if subscription_id:
+            update_data["stripe_subscription_id"] = subscription_id
+
+        client.table("user_profiles").update(update_data).eq("id", user_id).execute()
+        _invalidate_profile(user_id)
+        client.table("usage_logs").insert({
+            "user_id": user_id,
+            "action": "subscription_started",
+            "metadata": {"tier": tier}
+        }).execute()
+        return True
+    except Exception as e:
+        print(f"Error completing checkout: {e}")
+        return False
+
+
 async def log_usage(user_id: str, action: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
     """
     Log a usage event for analytics.
@@ -17,9 +17,15 @@ except LookupError:
 
 class TextProcessor:
     """Processes text data for semantic network analysis."""
-    
-    # Default English stopwords
-    DEFAULT_STOPWORDS = {
+
+    # Compiled once at class creation; clean_word runs per token, so this
+    # skips the re-module cache lookup on every call
+    _PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+    # Default English stopwords. A frozenset shared by every instance:
+    # the literals are compile-time interned, so per-token membership
+    # checks hash pre-interned strings
+    DEFAULT_STOPWORDS = frozenset({
         'a', 'about', 'above', 'after', 'again', 'against', 'all', 'am', 'an', 'and',
         'any', 'are', 'as', 'at', 'be', 'because', 'been', 'before', 'being', 'below',
         'between', 'both', 'but', 'by', 'can', 'cannot', 'could', 'did', 'do', 'does',
@@ -34,7 +40,7 @@ class TextProcessor:
         'until', 'up', 'very', 'was', 'we', 'were', 'what', 'when', 'where', 'which',
         'while', 'who', 'whom', 'why', 'will', 'with', 'would', 'you', 'your', 'yours',
         'yourself', 'yourselves', 'also', 'etc'
-    }
+    })
     
     def __init__(
         self,
@@ -54,16 +60,25 @@ class TextProcessor:
             min_word_length: Minimum word length to keep
             unify_plurals: Whether to automatically unify plural forms
         """
-        self.stopwords = stopwords or self.DEFAULT_STOPWORDS.copy()
+        # The shared default needs no per-instance copy; custom sets are
+        # frozen so lookups and reuse across processors stay cheap
+        self.stopwords = frozenset(stopwords) if stopwords else self.DEFAULT_STOPWORDS
         self.delete_words = delete_words or set()
         self.word_mappings = word_mappings or {}
         self.min_word_length = min_word_length
         self.unify_plurals = unify_plurals
+        self._rebuild_dropped()
+
+    def _rebuild_dropped(self):
+        """Recompute the combined drop set used in the per-token hot path."""
+        # One frozen union means a single hash lookup per token instead of
+        # separate stopword and delete-word checks
+        self._dropped = self.stopwords | self.delete_words
     
     def clean_word(self, word: str) -> str:
         """Clean a single word."""
         word = word.lower().strip()
-        word = re.sub(r'[^\w\s]', '', word)
+        word = self._PUNCTUATION_PATTERN.sub('', word)
         return word
     
     def get_singular(self, word: str) -> str:
@@ -101,7 +116,7 @@ class TextProcessor:
             return None
 
         # Check stopwords and delete words (pre-transformation)
-        if word in self.stopwords or word in self.delete_words:
+        if word in self._dropped:
             return None
 
         # Apply mappings
@@ -181,8 +196,9 @@ class TextProcessor:
     def add_delete_word(self, word: str):
         """Add a word to the delete list."""
         self.delete_words.add(word.lower())
-    
+        self._rebuild_dropped()
+
     def add_delete_words(self, words: List[str]):
         """Add multiple words to the delete list."""
-        for word in words:
-            self.add_delete_word(word)
+        self.delete_words.update(word.lower() for word in words)
+        self._rebuild_dropped()
@@ -6,12 +6,22 @@ FastAPI application for processing text data and building semantic networks.
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, List, Any
+import logging
 import tempfile
 import os
 
+# Application loggers (e.g. the per-request [TIMING] line) emit at INFO;
+# uvicorn only configures its own loggers, so without this the root
+# logger drops everything below WARNING
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s %(message)s",
+)
+
 from api.routes import router as api_router
 from core.config import settings
 from core import preload_model
@@ -36,6 +46,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -48,6 +59,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large graph payloads (nodes/edges JSON shrinks ~5x on the wire)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
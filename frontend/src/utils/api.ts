@@ -79,9 +79,9 @@ export async function analyzeMultiGroup(
 ): Promise<AnalysisResult> {
   const formData = new FormData();
 
-  // Add files with indexed keys
-  files.forEach((file, index) => {
-    formData.append(`file_${index}`, file);
+  // Add files as a repeated field, in group-config order
+  files.forEach((file) => {
+    formData.append('files', file);
   });
 
   // Add group configs as JSON (includes per-group min_score_threshold)